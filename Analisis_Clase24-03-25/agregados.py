@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from esquema import fechas_de
+
+
+@dataclass
+class Agregados:
+    """
+    Totales globales, por mes y por sucursal que consumen los pasos del reporte.
+    Las series por mes y por sucursal son None si falta la columna correspondiente.
+    """
+    filas: int
+    ventas_totales: float
+    socios_con_adeudo: int
+    socios_sin_adeudo: int
+    deuda_total: float
+    ventas_mes: pd.Series = None
+    pagos_mes: pd.DataFrame = None
+    ventas_sucursal: pd.Series = None
+    deudas_sucursal: pd.Series = None
+
+
+def columna_para_sumar(datos, col):
+    """
+    Columna lista para acumular: float32 (modo compacto) se suma en float64.
+    """
+    if col is None:
+        return pd.Series(np.nan, index=datos.index)
+    serie = datos[col]
+    if pd.api.types.is_float_dtype(serie) and serie.dtype.itemsize < 8:
+        return serie.astype(np.float64)
+    return serie
+
+
+def columnas_por_fila(datos, esquema):
+    """
+    Valores por fila que alimentan los parciales (sin modificar datos).
+    """
+    n = len(datos)
+    venta = columna_para_sumar(datos, esquema.venta)
+    deuda = columna_para_sumar(datos, esquema.deuda)
+    pago = columna_para_sumar(datos, esquema.pago)
+    return pd.DataFrame({
+        'n': np.ones(n, dtype=np.int64),
+        'ventas': venta,
+        'deuda': deuda,
+        'deuda_pos': deuda.where(deuda > 0, 0),
+        'con_adeudo': (deuda > 0).astype(np.int64),
+        'sin_adeudo': (deuda <= 0).astype(np.int64),
+        'pago': pago,
+    }, index=datos.index)
+
+
+def claves_grupo(datos, esquema):
+    """
+    Claves (sucursal, mes) del agrupamiento. Si falta alguna se usa una clave nula.
+    """
+    n = len(datos)
+    if esquema.sucursal:
+        sucursal = datos[esquema.sucursal].rename('sucursal')
+    else:
+        sucursal = pd.Series(np.full(n, np.nan), index=datos.index, name='sucursal')
+    if esquema.fecha_es_datetime():
+        mes = fechas_de(datos, esquema).dt.to_period('M').rename('mes')
+    else:
+        mes = pd.Series(pd.NaT, index=datos.index, name='mes')
+    return [sucursal, mes]
+
+
+def calcular_parciales(datos, esquema):
+    """
+    Una sola pasada agrupada por (sucursal, mes) con sumas, conteos
+    y media/M2 de pagos. Los parciales se pueden combinar con combinar_parciales.
+    """
+    filas = columnas_por_fila(datos, esquema)
+    g = filas.groupby(claves_grupo(datos, esquema), dropna=False, sort=True, observed=True)
+    partes = g.agg(
+        n=('n', 'sum'),
+        ventas=('ventas', 'sum'),
+        deuda=('deuda', 'sum'),
+        deuda_pos=('deuda_pos', 'sum'),
+        con_adeudo=('con_adeudo', 'sum'),
+        sin_adeudo=('sin_adeudo', 'sum'),
+        pago_n=('pago', 'count'),
+        pago_media=('pago', 'mean'),
+        pago_var=('pago', 'var'),
+    )
+    # M2 = suma de desviaciones al cuadrado (Welford/Chan)
+    partes['pago_m2'] = (partes['pago_var'] * (partes['pago_n'] - 1)).fillna(0)
+    # Las sucursales categóricas (modo compacto) se guardan con su valor simple
+    partes.index = partes.index.set_levels([
+        nivel.astype(nivel.categories.dtype) if isinstance(nivel, pd.CategoricalIndex) else nivel
+        for nivel in partes.index.levels
+    ])
+    return partes.drop(columns='pago_var')
+
+
+def combinar_parciales(partes, nivel=None):
+    """
+    Combina parciales por uno o varios niveles del índice ('sucursal', 'mes'),
+    o todos si nivel es None, usando la fórmula de Chan para la varianza.
+    """
+    if nivel is None:
+        claves = np.zeros(len(partes), dtype=np.int64)
+    elif isinstance(nivel, list):
+        claves = [partes.index.get_level_values(n) for n in nivel]
+    else:
+        claves = partes.index.get_level_values(nivel)
+    g = partes.groupby(claves, dropna=False, sort=True, observed=True)
+    sumas = g[['n', 'ventas', 'deuda', 'deuda_pos', 'con_adeudo', 'sin_adeudo', 'pago_n', 'pago_m2']].sum()
+
+    # Media combinada de cada grupo, repetida por fila para medir la desviación de cada parcial
+    pago_n = g['pago_n'].transform('sum')
+    ponderado = partes['pago_n'] * partes['pago_media'].fillna(0)
+    media_fila = ponderado.groupby(claves, dropna=False, observed=True).transform('sum') / pago_n.where(pago_n > 0)
+    desviacion = partes['pago_n'] * (partes['pago_media'] - media_fila) ** 2
+
+    sumas['pago_m2'] = sumas['pago_m2'] + desviacion.groupby(claves, dropna=False, sort=True, observed=True).sum()
+    sumas['pago_media'] = media_fila.groupby(claves, dropna=False, sort=True, observed=True).first()
+    sumas['pago_std'] = np.sqrt(sumas['pago_m2'] / (sumas['pago_n'] - 1).where(sumas['pago_n'] > 1))
+    return sumas
+
+
+def fusionar_parciales(*partes):
+    """
+    Fusiona parciales (sucursal, mes) calculados sobre bloques distintos de datos.
+    """
+    partes = [p for p in partes if p is not None and len(p)]
+    if not partes:
+        return None
+    fusion = combinar_parciales(pd.concat(partes), ['sucursal', 'mes'])
+    return fusion.drop(columns='pago_std')
+
+
+def margen_por_sucursal(agregados):
+    """
+    Utilidad y margen de utilidad (%) por sucursal.
+    """
+    utilidad = agregados.ventas_sucursal - agregados.deudas_sucursal
+    margen = (utilidad / agregados.ventas_sucursal) * 100
+    return utilidad, margen
+
+
+def agregados_desde_parciales(partes, esquema):
+    """
+    Construye el objeto Agregados a partir de los parciales (sucursal, mes).
+    """
+    total = combinar_parciales(partes).iloc[0] if len(partes) else None
+    agregados = Agregados(
+        filas=int(total['n']) if total is not None else 0,
+        ventas_totales=total['ventas'] if total is not None else 0,
+        socios_con_adeudo=int(total['con_adeudo']) if total is not None else 0,
+        socios_sin_adeudo=int(total['sin_adeudo']) if total is not None else 0,
+        deuda_total=total['deuda_pos'] if total is not None else 0,
+    )
+
+    if esquema.fecha_es_datetime():
+        por_mes = combinar_parciales(partes, 'mes')
+        por_mes = por_mes[por_mes.index.notna()]
+        if esquema.venta:
+            agregados.ventas_mes = por_mes['ventas']
+        if esquema.pago:
+            agregados.pagos_mes = por_mes[['pago_media', 'pago_std']].rename(
+                columns={'pago_media': 'mean', 'pago_std': 'std'})
+
+    if esquema.sucursal:
+        por_sucursal = combinar_parciales(partes, 'sucursal')
+        por_sucursal = por_sucursal[por_sucursal.index.notna()]
+        if esquema.venta:
+            agregados.ventas_sucursal = por_sucursal['ventas']
+            if esquema.deuda:
+                agregados.deudas_sucursal = por_sucursal['deuda']
+            else:
+                # 20% de las ventas como deuda simulada
+                agregados.deudas_sucursal = por_sucursal['ventas'] * 0.2
+        elif esquema.deuda:
+            agregados.deudas_sucursal = por_sucursal['deuda']
+
+    return agregados
+
+
+def calcular_agregados(datos, esquema):
+    """
+    Calcula en una sola pasada todos los agregados del reporte.
+    """
+    return agregados_desde_parciales(calcular_parciales(datos, esquema), esquema)
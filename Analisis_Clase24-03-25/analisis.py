@@ -1,42 +1,56 @@
+import argparse
+import os
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from cache_excel import leer_excel_cacheado, leer_libro
+from compacto import compactar
+from esquema import PATRONES_FECHA, buscar_columnas, columnas_numericas, resolver_esquema
+from agregados import calcular_agregados, margen_por_sucursal
+from incremental import agregados_incrementales
+from instrumentacion import Traza, registrar_error
+from render import dibujar, renderizar_graficas
 
-# Configuración para visualización
-plt.style.use('seaborn-v0_8-colorblind')  # Esquema de colores más atractivo
-plt.rcParams.update({
-    'font.size': 12, 
-    'figure.figsize': (12, 8),
-    'font.weight': 'bold',
-    'axes.labelweight': 'bold',
-    'axes.titleweight': 'bold',
-    'axes.titlesize': 16
-})
+RUTA_CATALOGO = 'Catalogo_sucursal.xlsx'
+RUTA_DATOS = 'proyecto1.xlsx'
 
-def cargar_datos():
+def cargar_datos(usar_cache=True, ruta_catalogo=RUTA_CATALOGO, ruta_datos=RUTA_DATOS):
     """
-    Carga los datos desde los archivos Excel.
+    Carga los datos desde los archivos Excel (o CSV, ver cache_excel.leer_libro).
+    Con usar_cache=True se usa un snapshot columnar que se regenera
+    automáticamente cuando cambia el libro de Excel.
     """
     try:
-        # Cargar archivo de catálogo de sucursales
-        catalogo_sucursal = pd.read_excel('Catalogo_sucursal.xlsx')
-        
-        # Cargar archivo de ventas y pagos
-        proyecto1 = pd.read_excel('proyecto1.xlsx')
+        if usar_cache:
+            # Cargar catálogo de sucursales y archivo de ventas y pagos
+            catalogo_sucursal, t_catalogo, warm_catalogo = leer_excel_cacheado(ruta_catalogo)
+            proyecto1, t_proyecto, warm_proyecto = leer_excel_cacheado(ruta_datos)
+            
+            for ruta, segundos, warm in [(ruta_catalogo, t_catalogo, warm_catalogo),
+                                         (ruta_datos, t_proyecto, warm_proyecto)]:
+                origen = 'snapshot (warm)' if warm else 'Excel (cold)'
+                print(f"   {os.path.basename(ruta)}: cargado desde {origen} en {segundos:.3f} s")
+        else:
+            # Cargar archivo de catálogo de sucursales
+            catalogo_sucursal = leer_libro(ruta_catalogo)
+            
+            # Cargar archivo de ventas y pagos
+            proyecto1 = leer_libro(ruta_datos)
         
         print("¡Datos cargados exitosamente!")
         return catalogo_sucursal, proyecto1
     
     except Exception as e:
         print(f"Error al cargar los datos: {e}")
+        registrar_error(e)
         return None, None
 
-def preparar_datos(catalogo_sucursal, proyecto1):
+def preparar_datos(catalogo_sucursal, proyecto1, compacto=False):
     """
     Prepara y limpia los datos para el análisis.
     Corrige problemas de tipo de datos.
+    Con compacto=True devuelve la representación compacta de compacto.py
+    (categorías, tipos numéricos reducidos y fechas como días int32).
     """
     try:
         # Convertir columnas a tipos numéricos adecuados
@@ -48,7 +62,7 @@ def preparar_datos(catalogo_sucursal, proyecto1):
             proyecto1[col] = pd.to_numeric(proyecto1[col], errors='coerce')
         
         # Identificar columnas de fecha (esto dependerá de tus datos reales)
-        fecha_cols = [col for col in proyecto1.columns if 'fecha' in col.lower() or 'date' in col.lower()]
+        fecha_cols = buscar_columnas(proyecto1.columns, PATRONES_FECHA)
         
         # Convertir columnas de fecha
         for col in fecha_cols:
@@ -63,32 +77,32 @@ def preparar_datos(catalogo_sucursal, proyecto1):
         print("Columnas disponibles en el dataset:")
         for col in proyecto1.columns:
             print(f"- {col}: {proyecto1[col].dtype}")
+        
+        if compacto:
+            proyecto1 = compactar(proyecto1, catalogo_sucursal)
             
         return proyecto1
     
     except Exception as e:
         print(f"Error al preparar los datos: {e}")
+        registrar_error(e)
         return None
 
-def analisis_ventas_totales(datos):
+def analisis_ventas_totales(datos, esquema=None, agregados=None):
     """
     1. Calcular las ventas totales del comercio
     """
     try:
-        # Buscar columnas que pueden contener información de ventas
-        venta_cols = [col for col in datos.columns if 'venta' in col.lower() or 'monto' in col.lower() or 'total' in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
         
-        if venta_cols:
-            # Convertir a numérico por si acaso
-            datos[venta_cols[0]] = pd.to_numeric(datos[venta_cols[0]], errors='coerce')
-            
-            # Calcular la suma
-            ventas_totales = datos[venta_cols[0]].sum()
+        if esquema.venta:
+            agregados = agregados or calcular_agregados(datos, esquema)
+            ventas_totales = agregados.ventas_totales
             print(f"\n1. VENTAS TOTALES DEL COMERCIO: ${ventas_totales:,.2f}")
             return ventas_totales
         else:
             # Si no se encuentran columnas específicas, intentamos sumar todas las columnas numéricas
-            numeric_cols = datos.select_dtypes(include=['float', 'int']).columns
+            numeric_cols = columnas_numericas(datos)
             
             # Seleccionar la columna con los valores más altos (probablemente ventas)
             if len(numeric_cols) > 0:
@@ -104,23 +118,21 @@ def analisis_ventas_totales(datos):
     
     except Exception as e:
         print(f"Error al calcular ventas totales: {e}")
+        registrar_error(e)
         return 0
 
-def analisis_adeudos(datos):
+def analisis_adeudos(datos, esquema=None, agregados=None, tareas=None):
     """
     2. Analizar cuántos socios tienen adeudo y cuántos no
     """
     try:
-        # Buscar columnas que puedan contener información de adeudos
-        adeudo_cols = [col for col in datos.columns if 'adeudo' in col.lower() or 'deuda' in col.lower() or 'saldo' in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
         
-        if adeudo_cols:
-            # Asegurar que la columna es numérica
-            datos[adeudo_cols[0]] = pd.to_numeric(datos[adeudo_cols[0]], errors='coerce')
-            
-            # Contar socios con y sin adeudo
-            socios_con_adeudo = (datos[adeudo_cols[0]] > 0).sum()
-            socios_sin_adeudo = (datos[adeudo_cols[0]] <= 0).sum()
+        if esquema.deuda:
+            # Socios con y sin adeudo (contados en la pasada de agregados)
+            agregados = agregados or calcular_agregados(datos, esquema)
+            socios_con_adeudo = agregados.socios_con_adeudo
+            socios_sin_adeudo = agregados.socios_sin_adeudo
             total_socios = socios_con_adeudo + socios_sin_adeudo
             
             # Calcular porcentajes
@@ -133,20 +145,10 @@ def analisis_adeudos(datos):
             print(f"   - Total de socios: {total_socios}")
             
             # Generar gráfico de pastel para visualizar
-            labels = [f'Con adeudo\n{porcentaje_con_adeudo:.1f}%', f'Sin adeudo\n{porcentaje_sin_adeudo:.1f}%']
-            sizes = [socios_con_adeudo, socios_sin_adeudo]
-            colors = ['#ff9999', '#66b3ff']
-            explode = (0.1, 0)  # Resaltar el primer slice
-            
-            plt.figure(figsize=(10, 8))
-            plt.pie(sizes, explode=explode, labels=labels, colors=colors,
-                   autopct='%1.1f%%', shadow=True, startangle=90, textprops={'fontsize': 14})
-            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-            plt.title('Distribución de Socios por Estado de Adeudo', fontsize=18)
-            plt.savefig('distribucion_adeudos.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print("   Gráfico de distribución de adeudos guardado como 'distribucion_adeudos.png'")
+            dibujar(tareas, 'dibujar_distribucion_adeudos', socios_con_adeudo, socios_sin_adeudo,
+                    porcentaje_con_adeudo, porcentaje_sin_adeudo, 'distribucion_adeudos.png',
+                    mensaje="   Gráfico de distribución de adeudos guardado como 'distribucion_adeudos.png'",
+                    error="Error al analizar adeudos")
             
             return socios_con_adeudo, socios_sin_adeudo, porcentaje_con_adeudo, porcentaje_sin_adeudo
         else:
@@ -155,170 +157,89 @@ def analisis_adeudos(datos):
     
     except Exception as e:
         print(f"Error al analizar adeudos: {e}")
+        registrar_error(e)
         return 0, 0, 0, 0
 
-def grafica_ventas_tiempo(datos):
+def grafica_ventas_tiempo(datos, esquema=None, agregados=None, tareas=None):
     """
     3. Graficar ventas totales respecto del tiempo
     """
     try:
-        # Buscar columnas de fecha y ventas
-        fecha_cols = [col for col in datos.columns if 'fecha' in col.lower() or 'date' in col.lower()]
-        venta_cols = [col for col in datos.columns if 'venta' in col.lower() or 'monto' in col.lower() or 'total' in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
+        venta_col = esquema.venta
         
-        if fecha_cols and venta_cols:
+        if esquema.fecha and venta_col:
             # Verificar si la columna de fecha tiene el formato correcto
-            if pd.api.types.is_datetime64_dtype(datos[fecha_cols[0]]):
-                # Convertir a período mensual
-                datos['mes'] = datos[fecha_cols[0]].dt.to_period('M')
-                
-                # Agrupar por mes y sumar ventas
-                ventas_mensuales = datos.groupby('mes')[venta_cols[0]].sum().reset_index()
-                ventas_mensuales['mes'] = ventas_mensuales['mes'].astype(str)
-                
-                # Crear gráfica de barras con diseño mejorado
-                plt.figure(figsize=(14, 8))
-                bars = plt.bar(ventas_mensuales['mes'], ventas_mensuales[venta_cols[0]], 
-                        color=sns.color_palette("viridis", len(ventas_mensuales)))
-                
-                # Añadir etiquetas encima de las barras
-                for bar in bars:
-                    height = bar.get_height()
-                    plt.text(bar.get_x() + bar.get_width()/2., height,
-                            f'${height:,.0f}',
-                            ha='center', va='bottom', rotation=0, fontsize=10)
-                
-                plt.title('Ventas Totales por Mes', fontsize=18, fontweight='bold')
-                plt.xlabel('Mes', fontsize=14)
-                plt.ylabel('Ventas ($)', fontsize=14)
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                plt.grid(axis='y', linestyle='--', alpha=0.7)
-                
-                # Añadir línea de tendencia
-                plt.plot(ventas_mensuales['mes'], ventas_mensuales[venta_cols[0]], 
-                        'ro-', alpha=0.6, linewidth=2, markersize=8)
-                
-                # Guardar gráfica con alta resolución
-                plt.savefig('ventas_mensuales.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                print("\n3. Gráfica de ventas totales respecto del tiempo generada y guardada como 'ventas_mensuales.png'")
+            if esquema.fecha_es_datetime():
+                # Ventas por mes ya agregadas
+                agregados = agregados or calcular_agregados(datos, esquema)
+                dibujar(tareas, 'dibujar_ventas_mensuales', agregados.ventas_mes.index.astype(str).tolist(),
+                        agregados.ventas_mes.to_numpy(), 'ventas_mensuales.png',
+                        mensaje="\n3. Gráfica de ventas totales respecto del tiempo generada y guardada como 'ventas_mensuales.png'",
+                        error="Error al generar gráfica de ventas por tiempo")
             else:
-                print(f"La columna {fecha_cols[0]} no tiene formato de fecha. Intente convertirla primero.")
+                print(f"La columna {esquema.fecha} no tiene formato de fecha. Intente convertirla primero.")
         else:
             print("No se encontraron columnas de fecha o ventas para generar la gráfica.")
             
             # Intentar generar una gráfica alternativa basada en índices
-            if venta_cols:
-                plt.figure(figsize=(14, 8))
-                datos_ord = datos.sort_values(by=venta_cols[0], ascending=False).head(20)
-                
-                plt.barh(range(len(datos_ord)), datos_ord[venta_cols[0]], 
-                       color=sns.color_palette("viridis", len(datos_ord)))
-                plt.yticks(range(len(datos_ord)), [f"Registro {i+1}" for i in range(len(datos_ord))])
-                plt.title('Top 20 Ventas', fontsize=18, fontweight='bold')
-                plt.xlabel('Monto ($)', fontsize=14)
-                plt.ylabel('Registros', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                plt.savefig('top_ventas.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                print("   Se generó una gráfica alternativa de las principales ventas: 'top_ventas.png'")
+            if venta_col:
+                # Solo se ordena la columna de ventas, no el DataFrame completo
+                top_ventas = datos[venta_col].sort_values(ascending=False).head(20)
+                dibujar(tareas, 'dibujar_top_ventas', top_ventas.to_numpy(), 'top_ventas.png',
+                        mensaje="   Se generó una gráfica alternativa de las principales ventas: 'top_ventas.png'",
+                        error="Error al generar gráfica de ventas por tiempo")
     
     except Exception as e:
         print(f"Error al generar gráfica de ventas por tiempo: {e}")
+        registrar_error(e)
 
-def grafica_desviacion_pagos(datos):
+def grafica_desviacion_pagos(datos, esquema=None, agregados=None, tareas=None):
     """
     4. Graficar la desviación estándar de pagos respecto del tiempo
     """
     try:
-        # Buscar columnas de fecha y pagos
-        fecha_cols = [col for col in datos.columns if 'fecha' in col.lower() or 'date' in col.lower()]
-        pago_cols = [col for col in datos.columns if 'pago' in col.lower() or 'abono' in col.lower()]
-        
-        if not pago_cols:
-            # Si no hay columnas específicas de pago, usar columnas numéricas que no sean ventas
-            venta_cols = [col for col in datos.columns if 'venta' in col.lower() or 'monto' in col.lower() or 'total' in col.lower()]
-            pago_cols = [col for col in datos.select_dtypes(include=['float', 'int']).columns 
-                         if col not in venta_cols and 'id' not in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
         
-        if fecha_cols and pago_cols:
+        if esquema.fecha and esquema.pago:
             # Verificar si la columna de fecha tiene el formato correcto
-            if pd.api.types.is_datetime64_dtype(datos[fecha_cols[0]]):
-                # Agrupar por mes
-                datos['mes'] = datos[fecha_cols[0]].dt.to_period('M')
-                
-                # Calcular estadísticas mensuales
-                stats_mensuales = datos.groupby('mes')[pago_cols[0]].agg(['mean', 'std']).reset_index()
-                stats_mensuales['mes'] = stats_mensuales['mes'].astype(str)
-                
-                # Crear gráfica
-                plt.figure(figsize=(14, 8))
-                
-                # Crear barras para la media
-                plt.bar(stats_mensuales['mes'], stats_mensuales['mean'], 
-                       alpha=0.5, color='steelblue', label='Media')
-                
-                # Añadir línea para la desviación estándar
-                plt.errorbar(stats_mensuales['mes'], stats_mensuales['mean'], 
-                           yerr=stats_mensuales['std'], fmt='o', color='darkred', 
-                           ecolor='darkred', elinewidth=2, capsize=6, label='Desviación Estándar')
-                
-                plt.title('Media y Desviación Estándar de Pagos por Mes', fontsize=18, fontweight='bold')
-                plt.xlabel('Mes', fontsize=14)
-                plt.ylabel('Valor ($)', fontsize=14)
-                plt.xticks(rotation=45)
-                plt.grid(True, linestyle='--', alpha=0.7)
-                plt.legend(fontsize=12)
-                plt.tight_layout()
-                
-                # Guardar gráfica
-                plt.savefig('desviacion_pagos.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                print("\n4. Gráfica de desviación estándar de pagos generada y guardada como 'desviacion_pagos.png'")
+            if esquema.fecha_es_datetime():
+                # Media y desviación estándar mensuales ya agregadas
+                agregados = agregados or calcular_agregados(datos, esquema)
+                stats_mensuales = agregados.pagos_mes
+                dibujar(tareas, 'dibujar_desviacion_pagos', stats_mensuales.index.astype(str).tolist(),
+                        stats_mensuales['mean'].to_numpy(), stats_mensuales['std'].to_numpy(),
+                        'desviacion_pagos.png',
+                        mensaje="\n4. Gráfica de desviación estándar de pagos generada y guardada como 'desviacion_pagos.png'",
+                        error="Error al generar gráfica de desviación de pagos")
             else:
-                print(f"La columna {fecha_cols[0]} no tiene formato de fecha. Intente convertirla primero.")
+                print(f"La columna {esquema.fecha} no tiene formato de fecha. Intente convertirla primero.")
         else:
             print("No se encontraron columnas de fecha o pagos para generar la gráfica.")
             
             # Generar un boxplot alternativo si hay datos numéricos
-            numeric_cols = datos.select_dtypes(include=['float', 'int']).columns.tolist()
+            numeric_cols = columnas_numericas(datos)
             if numeric_cols:
-                plt.figure(figsize=(14, 8))
-                sns.boxplot(data=datos[numeric_cols[:5]])  # Usar las primeras 5 columnas numéricas
-                plt.title('Distribución y Variabilidad de Valores', fontsize=18, fontweight='bold')
-                plt.xlabel('Variables', fontsize=14)
-                plt.ylabel('Valor', fontsize=14)
-                plt.grid(True, linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                plt.savefig('variabilidad_datos.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                print("   Se generó una gráfica alternativa de variabilidad de datos: 'variabilidad_datos.png'")
+                # Usar las primeras 5 columnas numéricas
+                dibujar(tareas, 'dibujar_variabilidad', datos[numeric_cols[:5]], 'variabilidad_datos.png',
+                        mensaje="   Se generó una gráfica alternativa de variabilidad de datos: 'variabilidad_datos.png'",
+                        error="Error al generar gráfica de desviación de pagos")
     
     except Exception as e:
         print(f"Error al generar gráfica de desviación de pagos: {e}")
+        registrar_error(e)
 
-def calcular_deuda_total(datos):
+def calcular_deuda_total(datos, esquema=None, agregados=None):
     """
     5. Calcular la deuda total de los clientes
     """
     try:
-        # Buscar columnas de deuda
-        deuda_cols = [col for col in datos.columns if 'adeudo' in col.lower() or 'deuda' in col.lower() or 'saldo' in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
         
-        if deuda_cols:
-            # Asegurar que la columna es numérica
-            datos[deuda_cols[0]] = pd.to_numeric(datos[deuda_cols[0]], errors='coerce')
-            
-            # Sumar todas las deudas (valores positivos)
-            deuda_total = datos[datos[deuda_cols[0]] > 0][deuda_cols[0]].sum()
+        if esquema.deuda:
+            # Suma de todas las deudas (valores positivos)
+            agregados = agregados or calcular_agregados(datos, esquema)
+            deuda_total = agregados.deuda_total
             
             print(f"\n5. DEUDA TOTAL DE LOS CLIENTES: ${deuda_total:,.2f}")
             return deuda_total
@@ -328,9 +249,10 @@ def calcular_deuda_total(datos):
     
     except Exception as e:
         print(f"Error al calcular deuda total: {e}")
+        registrar_error(e)
         return 0
 
-def calcular_porcentaje_utilidad(ventas_totales, deuda_total):
+def calcular_porcentaje_utilidad(ventas_totales, deuda_total, tareas=None):
     """
     6. Calcular el porcentaje de utilidad del comercio (ventas totales respecto a la deuda)
     """
@@ -347,41 +269,10 @@ def calcular_porcentaje_utilidad(ventas_totales, deuda_total):
             print(f"   - Porcentaje de utilidad: {porcentaje_utilidad:.2f}%")
             
             # Crear una gráfica de barras apiladas
-            plt.figure(figsize=(10, 6))
-            categorias = ['Resultado Financiero']
-            valores = [ventas_totales]
-            
-            plt.bar(categorias, valores, label='Ventas Totales', color='#4CAF50')
-            
-            if deuda_total > 0:
-                plt.bar(categorias, [-deuda_total], bottom=valores, label='Deuda Total', color='#F44336')
-            
-            # Añadir etiquetas con valores
-            plt.text(0, ventas_totales/2, f'${ventas_totales:,.0f}', ha='center', va='center', 
-                    color='white', fontweight='bold', fontsize=12)
-            
-            if deuda_total > 0:
-                plt.text(0, ventas_totales + (-deuda_total/2), f'-${deuda_total:,.0f}', 
-                        ha='center', va='center', color='white', fontweight='bold', fontsize=12)
-            
-            # Añadir texto de utilidad
-            plt.text(0, ventas_totales + 0.1 * ventas_totales, 
-                    f'Utilidad: ${utilidad:,.0f} ({porcentaje_utilidad:.1f}%)', 
-                    ha='center', va='bottom', fontweight='bold', fontsize=14, color='black')
-            
-            plt.title('Análisis de Utilidad', fontsize=18, fontweight='bold')
-            plt.ylabel('Monto ($)', fontsize=14)
-            plt.legend(loc='lower right')
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-            
-            # Ajustar límites para que se vea bien
-            max_value = max(ventas_totales, deuda_total)
-            plt.ylim(-max_value * 0.2, ventas_totales * 1.2)
-            
-            plt.savefig('analisis_utilidad.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print("   Gráfico de análisis de utilidad guardado como 'analisis_utilidad.png'")
+            dibujar(tareas, 'dibujar_utilidad', ventas_totales, deuda_total, utilidad, porcentaje_utilidad,
+                    'analisis_utilidad.png',
+                    mensaje="   Gráfico de análisis de utilidad guardado como 'analisis_utilidad.png'",
+                    error="Error al calcular porcentaje de utilidad")
             
             return utilidad, porcentaje_utilidad
         else:
@@ -390,34 +281,22 @@ def calcular_porcentaje_utilidad(ventas_totales, deuda_total):
     
     except Exception as e:
         print(f"Error al calcular porcentaje de utilidad: {e}")
+        registrar_error(e)
         return 0, 0
 
-def grafica_ventas_sucursal(datos, catalogo_sucursal):
+def grafica_ventas_sucursal(datos, catalogo_sucursal, esquema=None, agregados=None, tareas=None):
     """
     7. Crear gráfico circular de ventas por sucursal
     """
     try:
-        # Buscar columnas de sucursal y ventas
-        sucursal_cols = [col for col in datos.columns if 'sucursal' in col.lower() or 'tienda' in col.lower() or 'local' in col.lower()]
-        venta_cols = [col for col in datos.columns if 'venta' in col.lower() or 'monto' in col.lower() or 'total' in col.lower()]
-        
-        # Si no encontramos columna específica de sucursal, intentar usar cualquier columna categórica
-        if not sucursal_cols:
-            categorical_cols = datos.select_dtypes(include=['object']).columns.tolist()
-            if categorical_cols:
-                # Seleccionar la primera columna categórica que tenga menos de 20 valores únicos
-                for col in categorical_cols:
-                    if datos[col].nunique() < 20:
-                        sucursal_cols = [col]
-                        print(f"   Usando columna '{col}' como identificador de sucursal")
-                        break
+        esquema = esquema or resolver_esquema(datos)
+        if esquema.sucursal_inferida:
+            print(f"   Usando columna '{esquema.sucursal}' como identificador de sucursal")
         
-        if sucursal_cols and venta_cols:
-            # Asegurar que las columnas son del tipo correcto
-            datos[venta_cols[0]] = pd.to_numeric(datos[venta_cols[0]], errors='coerce')
-            
-            # Agrupar por sucursal y sumar ventas
-            ventas_por_sucursal = datos.groupby(sucursal_cols[0])[venta_cols[0]].sum()
+        if esquema.sucursal and esquema.venta:
+            # Ventas por sucursal ya agregadas
+            agregados = agregados or calcular_agregados(datos, esquema)
+            ventas_por_sucursal = agregados.ventas_sucursal
             
             # Calcular porcentajes
             total = ventas_por_sucursal.sum()
@@ -434,93 +313,41 @@ def grafica_ventas_sucursal(datos, catalogo_sucursal):
             df_sucursales = df_sucursales.sort_values('Ventas', ascending=False)
             
             # Crear gráfico circular mejorado
-            plt.figure(figsize=(12, 10))
-            
-            # Usar paleta de colores más atractiva
-            colors = plt.cm.tab20.colors
-            
-            # Crear el gráfico de pastel
-            wedges, texts, autotexts = plt.pie(
-                df_sucursales['Ventas'], 
-                labels=df_sucursales['Sucursal'],
-                autopct='%1.1f%%', 
-                startangle=90, 
-                shadow=True,
-                explode=[0.05 if i < 3 else 0 for i in range(len(df_sucursales))],  # Resaltar las 3 principales
-                colors=colors,
-                wedgeprops={'edgecolor': 'white', 'linewidth': 1.5},
-                textprops={'fontsize': 12, 'fontweight': 'bold'}
-            )
-            
-            # Personalizar textos
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-            
-            plt.title('Distribución de Ventas por Sucursal', fontsize=20, fontweight='bold', pad=20)
-            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-            
-            # Añadir leyenda separada para mejor visualización
-            plt.legend(
-                title='Sucursales',
-                loc='center left',
-                bbox_to_anchor=(1, 0, 0.5, 1),
-                fontsize=10
-            )
-            
-            plt.tight_layout()
-            
-            # Guardar gráfica con alta resolución
-            plt.savefig('ventas_por_sucursal.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print("\n7. Gráfico circular de ventas por sucursal generado y guardado como 'ventas_por_sucursal.png'")
+            dibujar(tareas, 'dibujar_ventas_sucursal', df_sucursales, 'ventas_por_sucursal.png',
+                    mensaje="\n7. Gráfico circular de ventas por sucursal generado y guardado como 'ventas_por_sucursal.png'",
+                    error="Error al generar gráfico de ventas por sucursal")
         else:
             print("No se encontraron columnas de sucursal o ventas para generar la gráfica.")
     
     except Exception as e:
         print(f"Error al generar gráfico de ventas por sucursal: {e}")
+        registrar_error(e)
 
-def grafica_deudas_vs_utilidad_sucursal(datos, catalogo_sucursal):
+def grafica_deudas_vs_utilidad_sucursal(datos, catalogo_sucursal, esquema=None, agregados=None, tareas=None):
     """
     8. Presentar gráfico de deudas totales por sucursal respecto al margen de utilidad
     """
+    sucursal_col = venta_col = deuda_col = None
     try:
-        # Buscar columnas necesarias
-        sucursal_cols = [col for col in datos.columns if 'sucursal' in col.lower() or 'tienda' in col.lower() or 'local' in col.lower()]
-        venta_cols = [col for col in datos.columns if 'venta' in col.lower() or 'monto' in col.lower() or 'total' in col.lower()]
-        deuda_cols = [col for col in datos.columns if 'adeudo' in col.lower() or 'deuda' in col.lower() or 'saldo' in col.lower()]
+        esquema = esquema or resolver_esquema(datos)
+        sucursal_col, venta_col, deuda_col = esquema.sucursal, esquema.venta, esquema.deuda
+        if esquema.sucursal_inferida:
+            print(f"   Usando columna '{sucursal_col}' como identificador de sucursal")
         
-        # Si no encontramos columna específica de sucursal, intentar usar cualquier columna categórica
-        if not sucursal_cols:
-            categorical_cols = datos.select_dtypes(include=['object']).columns.tolist()
-            if categorical_cols:
-                # Seleccionar la primera columna categórica que tenga menos de 20 valores únicos
-                for col in categorical_cols:
-                    if datos[col].nunique() < 20:
-                        sucursal_cols = [col]
-                        print(f"   Usando columna '{col}' como identificador de sucursal")
-                        break
-        
-        # Si no encontramos columna de deuda, usar una columna numérica alternativa
-        if not deuda_cols and venta_cols:
-            # Crear una columna sintética basada en ventas
-            datos['deuda_simulada'] = datos[venta_cols[0]] * 0.2  # 20% de las ventas como deuda simulada
-            deuda_cols = ['deuda_simulada']
+        # Si no encontramos columna de deuda, los agregados usan una deuda simulada
+        if not deuda_col and venta_col:
+            deuda_col = 'deuda_simulada'
             print("   No se encontró columna de deudas. Usando una deuda simulada del 20% de las ventas.")
         
-        if sucursal_cols and venta_cols and deuda_cols:
-            # Asegurar que las columnas son del tipo correcto
-            datos[venta_cols[0]] = pd.to_numeric(datos[venta_cols[0]], errors='coerce')
-            datos[deuda_cols[0]] = pd.to_numeric(datos[deuda_cols[0]], errors='coerce')
-            
-            # Agrupar por sucursal
-            ventas_por_sucursal = datos.groupby(sucursal_cols[0])[venta_cols[0]].sum()
-            deudas_por_sucursal = datos.groupby(sucursal_cols[0])[deuda_cols[0]].sum()
+        agregados = agregados or calcular_agregados(datos, esquema)
+        
+        if sucursal_col and venta_col and deuda_col:
+            # Ventas y deudas por sucursal ya agregadas
+            ventas_por_sucursal = agregados.ventas_sucursal
+            deudas_por_sucursal = agregados.deudas_sucursal
             
             # Calcular utilidad y margen por sucursal
-            utilidad_por_sucursal = ventas_por_sucursal - deudas_por_sucursal
-            margen_por_sucursal = (utilidad_por_sucursal / ventas_por_sucursal) * 100
+            utilidad_por_sucursal, margen_utilidad = margen_por_sucursal(agregados)
             
             # Crear dataframe para graficar
             df_analisis = pd.DataFrame({
@@ -528,174 +355,159 @@ def grafica_deudas_vs_utilidad_sucursal(datos, catalogo_sucursal):
                 'Ventas': ventas_por_sucursal.values,
                 'Deuda': deudas_por_sucursal.values,
                 'Utilidad': utilidad_por_sucursal.values,
-                'Margen_Utilidad': margen_por_sucursal.values
+                'Margen_Utilidad': margen_utilidad.values
             })
             
             # Ordenar por margen de utilidad
             df_analisis = df_analisis.sort_values('Margen_Utilidad', ascending=False)
             
             # Crear gráfico mejorado
-            plt.figure(figsize=(16, 12))
-            
-            # Definir esquema de colores
-            color_deuda = '#E57373'     # Rojo claro
-            color_utilidad = '#81C784'  # Verde claro
-            color_margen = '#5C6BC0'    # Azul
-
-            # Crear gráfico de barras apiladas con línea de margen
-            fig, ax1 = plt.subplots(figsize=(16, 10))
-            
-            # Calcular posiciones de las barras
-            x = np.arange(len(df_analisis))
-            width = 0.35
-            
-            # Crear barras para las ventas
-            bars1 = ax1.bar(x, df_analisis['Ventas'], width, label='Ventas', color='#64B5F6', edgecolor='white', linewidth=1)
-            
-            # Crear barras para las deudas (apiladas sobre las ventas)
-            bars2 = ax1.bar(x, -df_analisis['Deuda'], width, bottom=df_analisis['Ventas'], 
-                           label='Deuda', color=color_deuda, edgecolor='white', linewidth=1)
-            
-            # Crear barras para la utilidad
-            bars3 = ax1.bar(x + width, df_analisis['Utilidad'], width, label='Utilidad', 
-                           color=color_utilidad, edgecolor='white', linewidth=1)
-            
-            # Configurar primer eje
-            ax1.set_xlabel('Sucursal', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('Monto ($)', fontsize=14, fontweight='bold')
-            ax1.set_title('Análisis Financiero por Sucursal', fontsize=20, fontweight='bold', pad=20)
-            ax1.set_xticks(x + width / 2)
-            ax1.set_xticklabels(df_analisis['Sucursal'], rotation=45, ha='right')
-            
-            # Crear segundo eje para el margen de utilidad
-            ax2 = ax1.twinx()
-            line = ax2.plot(x + width/2, df_analisis['Margen_Utilidad'], 'o-', linewidth=3, 
-                          markersize=10, color=color_margen, label='Margen de Utilidad (%)')
-            ax2.set_ylabel('Margen de Utilidad (%)', fontsize=14, fontweight='bold', color=color_margen)
-            ax2.tick_params(axis='y', colors=color_margen)
-            
-            # Añadir etiquetas a los puntos de margen
-            for i, valor in enumerate(df_analisis['Margen_Utilidad']):
-                ax2.annotate(f'{valor:.1f}%', (x[i] + width/2, valor), 
-                           xytext=(0, 10), textcoords='offset points',
-                           ha='center', va='bottom', fontweight='bold', color=color_margen)
-            
-            # Añadir cuadrícula
-            ax1.grid(axis='y', linestyle='--', alpha=0.3)
-            
-            # Combinar las leyendas de ambos ejes
-            handles1, labels1 = ax1.get_legend_handles_labels()
-            handles2, labels2 = ax2.get_legend_handles_labels()
-            ax1.legend(handles1 + handles2, labels1 + labels2, loc='upper center', 
-                     bbox_to_anchor=(0.5, -0.15), ncol=4, fontsize=12, frameon=True)
-            
-            # Ajustar diseño
-            plt.tight_layout()
-            
-            # Guardar gráfica con alta resolución
-            plt.savefig('deudas_vs_margen_sucursal.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print("\n8. Gráfico de deudas vs margen de utilidad por sucursal generado y guardado como 'deudas_vs_margen_sucursal.png'")
+            dibujar(tareas, 'dibujar_deudas_vs_margen', df_analisis, 'deudas_vs_margen_sucursal.png',
+                    mensaje="\n8. Gráfico de deudas vs margen de utilidad por sucursal generado y guardado como 'deudas_vs_margen_sucursal.png'",
+                    error="Error al generar gráfico de deudas vs utilidad por sucursal")
         else:
             print("No se encontraron las columnas necesarias para generar la gráfica.")
             
             # Generar una gráfica alternativa si hay suficientes datos
-            if sucursal_cols and (venta_cols or deuda_cols):
-                plt.figure(figsize=(14, 8))
-                
-                if venta_cols:
-                    valores = datos.groupby(sucursal_cols[0])[venta_cols[0]].sum().sort_values(ascending=False)
+            if sucursal_col and (venta_col or deuda_col):
+                if venta_col:
+                    valores = agregados.ventas_sucursal.sort_values(ascending=False)
                     titulo = 'Ventas por Sucursal'
                 else:
-                    valores = datos.groupby(sucursal_cols[0])[deuda_cols[0]].sum().sort_values(ascending=False)
+                    valores = agregados.deudas_sucursal.sort_values(ascending=False)
                     titulo = 'Deudas por Sucursal'
                 
-                # Generar gráfico de barras horizontal
-                plt.barh(valores.index, valores, color=plt.cm.viridis(np.linspace(0, 1, len(valores))))
-                
-                # Añadir valores al final de cada barra
-                for i, v in enumerate(valores):
-                    plt.text(v + 0.01*max(valores), i, f'${v:,.0f}', va='center', fontweight='bold')
-                
-                plt.title(titulo, fontsize=18, fontweight='bold')
-                plt.xlabel('Monto ($)', fontsize=14)
-                plt.ylabel('Sucursal', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                
-                plt.savefig('analisis_alternativo_sucursal.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                print("   Se generó una gráfica alternativa: 'analisis_alternativo_sucursal.png'")
+                dibujar(tareas, 'dibujar_sucursal_alternativa', valores, titulo, 'analisis_alternativo_sucursal.png',
+                        mensaje="   Se generó una gráfica alternativa: 'analisis_alternativo_sucursal.png'",
+                        error="Error al generar gráfico de deudas vs utilidad por sucursal")
     
     except Exception as e:
         print(f"Error al generar gráfico de deudas vs utilidad por sucursal: {e}")
+        registrar_error(e)
         
         # Intentar generar gráfico simplificado en caso de error
         try:
-            if sucursal_cols and venta_cols:
-                plt.figure(figsize=(12, 8))
-                valores = datos.groupby(sucursal_cols[0])[venta_cols[0]].sum().sort_values(ascending=False)
-                plt.bar(valores.index, valores, color='darkblue')
-                plt.title('Ventas por Sucursal', fontsize=16)
-                plt.xticks(rotation=45, ha='right')
-                plt.tight_layout()
-                plt.savefig('ventas_sucursal_simple.png', dpi=300)
-                plt.close()
-                print("   Se generó una gráfica simplificada: 'ventas_sucursal_simple.png'")
+            if sucursal_col and venta_col:
+                valores = datos.groupby(sucursal_col)[venta_col].sum().sort_values(ascending=False)
+                dibujar(None, 'dibujar_ventas_sucursal_simple', valores, 'ventas_sucursal_simple.png',
+                        mensaje="   Se generó una gráfica simplificada: 'ventas_sucursal_simple.png'")
         except:
             print("   No se pudo generar ninguna gráfica alternativa.")
 
-def generar_reporte_completo():
+def ejecutar_reporte(catalogo_sucursal, proyecto1, trabajadores=None, incremental=False, traza=None,
+                     compacto=False, graficas=True):
     """
-    Función principal que ejecuta todos los análisis
+    Todas las etapas del reporte a partir de los datos ya cargados
+    (la comparten generar_reporte_completo y benchmark.py).
+    Con graficas=False las gráficas se preparan pero no se dibujan.
+    Devuelve False si los datos no se pudieron preparar.
     """
-    print("=" * 80)
-    print("REPORTE DE ANÁLISIS DE VENTAS Y ADEUDOS DEL COMERCIO")
-    print("=" * 80)
-    
-    # Cargar datos
-    catalogo_sucursal, proyecto1 = cargar_datos()
-    
-    if catalogo_sucursal is None or proyecto1 is None:
-        print("No se pudieron cargar los datos. Verifica que los archivos existen y tienen el formato correcto.")
-        return
+    traza = traza or Traza()
+    medir = traza.medir
     
     # Preparar datos
-    datos = preparar_datos(catalogo_sucursal, proyecto1)
+    datos = medir('preparar_datos', preparar_datos, catalogo_sucursal, proyecto1, compacto)
     
     if datos is None:
         print("No se pudieron preparar los datos para el análisis.")
-        return
+        return False
+    
+    # Resolver columnas y tipos una sola vez para todos los pasos
+    esquema = medir('resolver_esquema', resolver_esquema, datos)
+    
+    # Calcular todos los totales, por mes y por sucursal en una sola pasada
+    if incremental:
+        agregados = medir('agregados_incrementales', agregados_incrementales, datos, esquema)
+    else:
+        agregados = medir('calcular_agregados', calcular_agregados, datos, esquema)
+    
+    # Gráficas pendientes para la etapa de render (None = dibujar en serie,
+    # también cuando solo hay un núcleo y el pool no ganaría nada)
+    if not graficas:
+        tareas = []
+    else:
+        tareas = None if (trabajadores or os.cpu_count() or 1) <= 1 else []
     
     # 1. Calcular ventas totales
-    ventas_totales = analisis_ventas_totales(datos)
+    ventas_totales = medir('analisis_ventas_totales', analisis_ventas_totales, datos, esquema, agregados)
     
     # 2. Analizar socios con/sin adeudo
-    analisis_adeudos(datos)
+    medir('analisis_adeudos', analisis_adeudos, datos, esquema, agregados, tareas)
     
     # 3. Graficar ventas por tiempo
-    grafica_ventas_tiempo(datos)
+    medir('grafica_ventas_tiempo', grafica_ventas_tiempo, datos, esquema, agregados, tareas)
     
     # 4. Graficar desviación estándar de pagos
-    grafica_desviacion_pagos(datos)
+    medir('grafica_desviacion_pagos', grafica_desviacion_pagos, datos, esquema, agregados, tareas)
     
     # 5. Calcular deuda total
-    deuda_total = calcular_deuda_total(datos)
+    deuda_total = medir('calcular_deuda_total', calcular_deuda_total, datos, esquema, agregados)
     
     # 6. Calcular porcentaje de utilidad
-    calcular_porcentaje_utilidad(ventas_totales, deuda_total)
+    medir('calcular_porcentaje_utilidad', calcular_porcentaje_utilidad, ventas_totales, deuda_total, tareas)
     
     # 7. Graficar ventas por sucursal
-    grafica_ventas_sucursal(datos, catalogo_sucursal)
+    medir('grafica_ventas_sucursal', grafica_ventas_sucursal, datos, catalogo_sucursal, esquema, agregados, tareas)
     
     # 8. Graficar deudas vs utilidad por sucursal
-    grafica_deudas_vs_utilidad_sucursal(datos, catalogo_sucursal)
+    medir('grafica_deudas_vs_utilidad_sucursal', grafica_deudas_vs_utilidad_sucursal,
+          datos, catalogo_sucursal, esquema, agregados, tareas)
+    
+    # Dibujar en paralelo las gráficas pendientes
+    if tareas and graficas:
+        medir('renderizar_graficas', renderizar_graficas, tareas, trabajadores, traza)
+    
+    return True
+
+def generar_reporte_completo(trabajadores=None, incremental=False, traza=None, resumen=False, compacto=False,
+                             ruta_catalogo=RUTA_CATALOGO, ruta_datos=RUTA_DATOS, graficas=True):
+    """
+    Función principal que ejecuta todos los análisis.
+    Las gráficas se dibujan al final en un pool de procesos con
+    trabajadores procesos (None = todos los núcleos, 1 = en serie).
+    Con incremental=True solo se agregan las filas posteriores a la
+    última fecha procesada en la corrida anterior.
+    Cada etapa se mide con traza (una Traza de instrumentacion.py);
+    con resumen=True se imprime la tabla de tiempos al final.
+    Con compacto=True el libro se guarda en memoria en su forma compacta.
+    """
+    traza = traza or Traza()
+    
+    print("=" * 80)
+    print("REPORTE DE ANÁLISIS DE VENTAS Y ADEUDOS DEL COMERCIO")
+    print("=" * 80)
+    
+    # Cargar datos
+    catalogo_sucursal, proyecto1 = traza.medir('cargar_datos', cargar_datos, True, ruta_catalogo, ruta_datos)
+    
+    if catalogo_sucursal is None or proyecto1 is None:
+        print("No se pudieron cargar los datos. Verifica que los archivos existen y tienen el formato correcto.")
+        return
+    
+    if not ejecutar_reporte(catalogo_sucursal, proyecto1, trabajadores, incremental, traza, compacto, graficas):
+        return
     
     print("\n" + "=" * 80)
     print("ANÁLISIS COMPLETADO - Los gráficos se han guardado en el directorio actual")
     print("=" * 80)
+    
+    if resumen:
+        traza.resumen()
 
 if __name__ == "__main__":
-    generar_reporte_completo()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Reporte de análisis de ventas y adeudos")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos para dibujar las gráficas (1 = en serie)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Procesar solo las filas nuevas desde la última corrida")
+    parser.add_argument('--traza', default=None,
+                        help="Archivo JSON lines con tiempo, CPU, memoria y filas por etapa")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Medir también la memoria asignada por etapa con tracemalloc")
+    parser.add_argument('--resumen', action='store_true',
+                        help="Imprimir la tabla de tiempos por etapa al final")
+    parser.add_argument('--compacto', action='store_true',
+                        help="Guardar el libro con categorías, tipos reducidos y fechas como días")
+    args = parser.parse_args()
+    traza = Traza(args.traza, usar_tracemalloc=args.tracemalloc)
+    generar_reporte_completo(args.trabajadores, args.incremental, traza, args.resumen, args.compacto)
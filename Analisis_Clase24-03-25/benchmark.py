@@ -0,0 +1,154 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import analisis
+from datos_sinteticos import escribir_csv, generar_bloques, generar_catalogo
+from instrumentacion import Traza, rss_maximo_kb
+from streaming import acumular_por_bloques
+
+TAMANOS = [10**5, 10**6, 10**7]
+
+
+def reporte_sintetico(traza, directorio, filas, sucursales, dias, semilla, tam_bloque, caliente=False,
+                      graficas=False, trabajadores=None, incremental=False, compacto=False):
+    """
+    Escribe el libro y el catálogo sintéticos en CSV y corre generar_reporte_completo
+    sobre ellos, así que también se miden cargar_datos y su snapshot.
+    Con caliente=True se carga una vez antes para medir la carga desde el snapshot.
+    Los mensajes del reporte se descartan para no medir la consola.
+    """
+    ruta_catalogo = os.path.join(directorio, 'catalogo_sintetico.csv')
+    ruta_datos = os.path.join(directorio, 'ledger_sintetico.csv')
+    generar_catalogo(sucursales).to_csv(ruta_catalogo, index=False)
+    traza.medir('escribir_csv', escribir_csv, ruta_datos, filas, tam_bloque,
+                n_sucursales=sucursales, dias=dias, semilla=semilla)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if caliente:
+            analisis.cargar_datos(True, ruta_catalogo, ruta_datos)
+        inicio = time.perf_counter()
+        analisis.generar_reporte_completo(trabajadores, incremental, traza, compacto=compacto,
+                                          ruta_catalogo=ruta_catalogo, ruta_datos=ruta_datos,
+                                          graficas=graficas)
+    return time.perf_counter() - inicio
+
+
+def correr(filas, modo='memoria', sucursales=25, dias=365, tam_bloque=1_000_000, graficas=False, semilla=0,
+           caliente=False, trabajadores=None, incremental=False, compacto=False):
+    """
+    Una corrida del benchmark en este proceso. Devuelve un diccionario con
+    el tiempo por etapa, las filas/s de todo el pipeline y el pico de memoria.
+    La corrida trabaja en un directorio temporal (snapshots, estado y gráficas).
+    """
+    traza = Traza()
+    inicio = time.perf_counter()
+
+    if modo == 'memoria':
+        directorio_original = os.getcwd()
+        with tempfile.TemporaryDirectory() as directorio:
+            os.chdir(directorio)
+            try:
+                segundos_pipeline = reporte_sintetico(traza, directorio, filas, sucursales, dias, semilla,
+                                                      tam_bloque, caliente, graficas, trabajadores,
+                                                      incremental, compacto)
+            finally:
+                os.chdir(directorio_original)
+    else:
+        # En modo por bloques la generación va intercalada con la agregación
+        bloques = generar_bloques(filas, tam_bloque, n_sucursales=sucursales, dias=dias, semilla=semilla)
+        inicio_pipeline = time.perf_counter()
+        traza.medir('acumular_por_bloques', acumular_por_bloques, bloques)
+        segundos_pipeline = time.perf_counter() - inicio_pipeline
+
+    return {
+        'filas': filas,
+        'modo': modo,
+        'sucursales': sucursales,
+        'dias': dias,
+        'semilla': semilla,
+        'caliente': caliente,
+        'incremental': incremental,
+        'compacto': compacto,
+        'segundos_total': time.perf_counter() - inicio,
+        'segundos_pipeline': segundos_pipeline,
+        'filas_por_segundo': filas / segundos_pipeline if segundos_pipeline > 0 else None,
+        'rss_pico_kb': rss_maximo_kb(),
+        'etapas': {r['etapa']: round(r['wall_s'], 6) for r in traza.registros if 'wall_s' in r},
+    }
+
+
+def correr_aislado(filas, **opciones):
+    """
+    Ejecuta una corrida en un proceso nuevo para que el pico de memoria sea solo suyo.
+    """
+    comando = [sys.executable, __file__, '--una', '--tamanos', str(filas)]
+    for clave, valor in opciones.items():
+        if valor is None:
+            continue
+        if isinstance(valor, bool):
+            if valor:
+                comando.append(f"--{clave.replace('_', '-')}")
+        else:
+            comando += [f"--{clave.replace('_', '-')}", str(valor)]
+    salida = subprocess.run(comando, capture_output=True, text=True)
+    if salida.returncode != 0:
+        return {'filas': filas, 'error': salida.stderr.strip().splitlines()[-1:]}
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def imprimir_resultados(resultados):
+    print("\n" + "=" * 80)
+    print("BENCHMARK DEL PIPELINE DE ANÁLISIS")
+    print("=" * 80)
+    for r in resultados:
+        if 'error' in r:
+            print(f"\n{r['filas']:,} filas: ERROR {r['error']}")
+            continue
+        print(f"\n{r['filas']:,} filas ({r['modo']}): {r['segundos_pipeline']:.2f} s, "
+              f"{r['filas_por_segundo']:,.0f} filas/s, pico RSS {r['rss_pico_kb'] / 1024:,.0f} MB")
+        for etapa, segundos in sorted(r['etapas'].items(), key=lambda x: -x[1]):
+            print(f"   - {etapa}: {segundos:.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de analisis.py con datos sintéticos")
+    parser.add_argument('--tamanos', type=float, nargs='+', default=TAMANOS,
+                        help="Número de filas de cada corrida (p. ej. 1e5 1e6 1e7 1e8)")
+    parser.add_argument('--modo', choices=['memoria', 'bloques'], default='memoria')
+    parser.add_argument('--sucursales', type=int, default=25)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--tam-bloque', type=int, default=1_000_000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--graficas', action='store_true', help="Incluir el dibujo de las gráficas")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos para dibujar las gráficas (1 = en serie)")
+    parser.add_argument('--caliente', action='store_true',
+                        help="Medir la carga desde el snapshot (se carga una vez antes)")
+    parser.add_argument('--incremental', action='store_true', help="Correr el reporte en modo incremental")
+    parser.add_argument('--compacto', action='store_true', help="Correr el reporte en modo compacto")
+    parser.add_argument('--salida', default=None, help="Agregar los resultados a un archivo JSON lines")
+    parser.add_argument('--una', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    opciones = dict(modo=args.modo, sucursales=args.sucursales, dias=args.dias,
+                    tam_bloque=args.tam_bloque, graficas=args.graficas, semilla=args.semilla,
+                    caliente=args.caliente, trabajadores=args.trabajadores,
+                    incremental=args.incremental, compacto=args.compacto)
+
+    if args.una:
+        # Corrida interna lanzada por correr_aislado
+        print(json.dumps(correr(int(args.tamanos[0]), **opciones)))
+    else:
+        resultados = [correr_aislado(int(filas), **opciones) for filas in args.tamanos]
+        imprimir_resultados(resultados)
+        if args.salida:
+            with open(args.salida, 'a', encoding='utf-8') as archivo:
+                for r in resultados:
+                    archivo.write(json.dumps(r, ensure_ascii=False) + '\n')
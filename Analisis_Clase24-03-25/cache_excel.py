@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_CACHE = '.cache_datos'
+
+
+def clave_archivo(ruta):
+    """
+    Clave del snapshot: ruta absoluta, tamaño y fecha de modificación del libro.
+    """
+    info = os.stat(ruta)
+    firma = f"{os.path.abspath(ruta)}|{info.st_size}|{info.st_mtime_ns}"
+    return hashlib.sha1(firma.encode('utf-8')).hexdigest()[:16]
+
+
+def ruta_snapshot(ruta, directorio_cache=DIRECTORIO_CACHE):
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(directorio_cache, f"{nombre}-{clave_archivo(ruta)}.npz")
+
+
+def guardar_snapshot(df, destino):
+    """
+    Guarda el DataFrame columna por columna en un archivo .npz.
+    Las columnas de texto se guardan como unicode con una máscara de nulos.
+    """
+    arreglos = {}
+    columnas = []
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_datetime64_dtype(serie):
+            arreglos[f"c{i}"] = serie.to_numpy()
+            columnas.append({'nombre': str(col), 'tipo': 'nativo'})
+        else:
+            nulos = serie.isna().to_numpy()
+            arreglos[f"c{i}"] = serie.astype(str).to_numpy(dtype=str)
+            arreglos[f"n{i}"] = nulos
+            columnas.append({'nombre': str(col), 'tipo': 'texto'})
+    arreglos['__meta__'] = np.array(json.dumps(columnas))
+
+    # Escribir a un temporal y renombrar para no dejar snapshots a medias
+    temporal = destino + '.tmp.npz'
+    np.savez(temporal, **arreglos)
+    os.replace(temporal, destino)
+
+
+def cargar_snapshot(origen):
+    """
+    Reconstruye el DataFrame guardado por guardar_snapshot.
+    """
+    with np.load(origen, allow_pickle=False) as arch:
+        columnas = json.loads(str(arch['__meta__']))
+        datos = {}
+        for i, col in enumerate(columnas):
+            valores = arch[f"c{i}"]
+            if col['tipo'] == 'texto':
+                datos[col['nombre']] = pd.Series(valores).where(~arch[f"n{i}"])
+            else:
+                datos[col['nombre']] = valores
+    return pd.DataFrame(datos)
+
+
+def limpiar_snapshots(ruta, vigente, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Elimina snapshots anteriores del mismo libro que ya no corresponden.
+    """
+    prefijo = os.path.splitext(os.path.basename(ruta))[0] + '-'
+    for nombre in os.listdir(directorio_cache):
+        completo = os.path.join(directorio_cache, nombre)
+        if nombre.startswith(prefijo) and nombre.endswith('.npz') and completo != vigente:
+            os.remove(completo)
+
+
+def leer_libro(ruta, **kwargs):
+    """
+    Lee un libro de Excel, o un CSV si la ruta termina en .csv (p. ej. el
+    libro sintético del benchmark, que no cabe en una hoja de Excel).
+    """
+    if ruta.lower().endswith('.csv'):
+        return pd.read_csv(ruta, **kwargs)
+    return pd.read_excel(ruta, **kwargs)
+
+
+def leer_excel_cacheado(ruta, directorio_cache=DIRECTORIO_CACHE, **kwargs):
+    """
+    Lee un libro de Excel (o CSV, ver leer_libro) usando un snapshot columnar si está vigente.
+    El snapshot se invalida solo cuando cambia el tamaño o la fecha del libro.
+    Devuelve el DataFrame, el tiempo de carga y si vino del snapshot.
+    """
+    inicio = time.perf_counter()
+    destino = ruta_snapshot(ruta, directorio_cache)
+
+    if os.path.exists(destino):
+        try:
+            df = cargar_snapshot(destino)
+            return df, time.perf_counter() - inicio, True
+        except Exception as e:
+            print(f"Snapshot dañado para {ruta}, se regenera: {e}")
+
+    df = leer_libro(ruta, **kwargs)
+    try:
+        os.makedirs(directorio_cache, exist_ok=True)
+        guardar_snapshot(df, destino)
+        limpiar_snapshots(ruta, destino, directorio_cache)
+    except Exception as e:
+        print(f"No se pudo guardar el snapshot de {ruta}: {e}")
+    return df, time.perf_counter() - inicio, False
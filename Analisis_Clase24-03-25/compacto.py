@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Valor que representa una fecha nula en las columnas de días (int32 no admite NaN)
+FECHA_NULA = np.iinfo(np.int32).min
+MAX_PROPORCION_CATEGORIAS = 0.5
+# 2^63: los flotantes con valor absoluto menor caben en int64
+LIMITE_INT64 = 2.0 ** 63
+
+
+def memoria_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def reducir_numerico(serie):
+    """
+    Convierte a la representación numérica más pequeña sin perder valores.
+    Los flotantes solo pasan a float32 si todos los valores se conservan exactos.
+    """
+    if pd.api.types.is_bool_dtype(serie):
+        return serie
+    if pd.api.types.is_integer_dtype(serie):
+        return pd.to_numeric(serie, downcast='integer')
+    if pd.api.types.is_float_dtype(serie):
+        valores = serie.to_numpy()
+        # Flotantes que en realidad son enteros (finitos y dentro de int64) se guardan como enteros
+        if (np.isfinite(valores).all() and np.array_equal(valores, np.round(valores))
+                and (np.abs(valores) < LIMITE_INT64).all()):
+            return pd.to_numeric(serie.astype(np.int64), downcast='integer')
+        reducido = valores.astype(np.float32)
+        if np.array_equal(reducido.astype(valores.dtype), valores, equal_nan=True):
+            return pd.Series(reducido, index=serie.index, name=serie.name)
+    return serie
+
+
+def fechas_a_dias(serie):
+    """
+    Convierte una columna de fechas a días (int32) desde la fecha mínima.
+    Devuelve la serie de días y la época usada.
+    """
+    epoca = serie.min().normalize() if serie.notna().any() else pd.Timestamp('1970-01-01')
+    dias = (serie - epoca).dt.days
+    dias = dias.fillna(FECHA_NULA).astype(np.int32)
+    return dias, epoca
+
+
+def dias_a_fechas(dias, epoca):
+    """
+    Operación inversa de fechas_a_dias (las fechas nulas vuelven como NaT).
+    """
+    valores = dias.to_numpy()
+    fechas = np.datetime64(epoca, 'D') + valores.astype('timedelta64[D]')
+    fechas = fechas.astype('datetime64[ns]')
+    fechas[valores == FECHA_NULA] = np.datetime64('NaT')
+    return pd.Series(fechas, index=dias.index, name=dias.name)
+
+
+def categorias_sucursal(serie, catalogo_sucursal):
+    """
+    Categórica de sucursal con las claves del catálogo como categorías
+    (más las claves que aparezcan en los datos y no estén en el catálogo).
+    """
+    clave = catalogo_sucursal.columns[0]
+    categorias = pd.Index(catalogo_sucursal[clave].dropna().unique())
+    extras = pd.Index(serie.dropna().unique()).difference(categorias)
+    return pd.Series(pd.Categorical(serie, categories=categorias.append(extras)),
+                     index=serie.index, name=serie.name)
+
+
+def compactar(datos, catalogo_sucursal=None):
+    """
+    Representación compacta del libro:
+    - texto con pocos valores distintos -> categórica (la sucursal de texto con las claves del catálogo)
+    - enteros y flotantes -> el tipo más pequeño que conserve los valores
+    - fechas -> días int32 desde una época guardada en datos.attrs['epocas_fecha']
+    Imprime la memoria antes y después.
+    """
+    antes = memoria_mb(datos)
+    compacto = {}
+    epocas = {}
+
+    for col in datos.columns:
+        serie = datos[col]
+        if pd.api.types.is_datetime64_dtype(serie):
+            compacto[col], epocas[col] = fechas_a_dias(serie)
+        elif (catalogo_sucursal is not None and col == catalogo_sucursal.columns[0]
+              and not pd.api.types.is_numeric_dtype(serie)):
+            # Las claves numéricas siguen siendo números (y columnas numéricas del reporte)
+            compacto[col] = categorias_sucursal(serie, catalogo_sucursal)
+        elif pd.api.types.is_numeric_dtype(serie):
+            compacto[col] = reducir_numerico(serie)
+        elif isinstance(serie.dtype, pd.CategoricalDtype):
+            compacto[col] = serie
+        elif serie.nunique() <= MAX_PROPORCION_CATEGORIAS * max(len(serie), 1):
+            compacto[col] = serie.astype('category')
+        else:
+            compacto[col] = serie
+
+    resultado = pd.DataFrame(compacto, index=datos.index)
+    resultado.attrs['epocas_fecha'] = epocas
+    despues = memoria_mb(resultado)
+    print(f"Modo compacto: {antes:,.2f} MB -> {despues:,.2f} MB "
+          f"({(1 - despues / antes) * 100 if antes else 0:.1f}% menos)")
+    return resultado
@@ -0,0 +1,76 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+TAM_BLOQUE = 1_000_000
+
+
+def nombres_sucursales(n_sucursales):
+    return np.array([f"SUC{i:03d}" for i in range(1, n_sucursales + 1)])
+
+
+def generar_catalogo(n_sucursales=25):
+    """
+    Catálogo de sucursales del libro sintético; como Catalogo_sucursal,
+    la primera columna es la clave que aparece en el libro.
+    """
+    sucursales = nombres_sucursales(n_sucursales)
+    return pd.DataFrame({'sucursal': sucursales, 'nombre': [f"Sucursal {s[3:]}" for s in sucursales]})
+
+
+def generar_ledger(filas, n_sucursales=25, fecha_inicio='2020-01-01', dias=365,
+                   semilla=0, desplazamiento=0):
+    """
+    Genera un libro de ventas sintético con las mismas convenciones de columnas
+    que proyecto1 (fecha, sucursal, venta, adeudo, pago).
+    desplazamiento numera las filas cuando se genera por bloques.
+    """
+    rng = np.random.default_rng(semilla)
+    sucursales = nombres_sucursales(n_sucursales)
+
+    # Ventas log-normales; alrededor del 40% de los socios con adeudo
+    venta = np.round(rng.lognormal(mean=8, sigma=1, size=filas), 2)
+    con_adeudo = rng.random(filas) < 0.4
+    adeudo = np.where(con_adeudo, np.round(venta * rng.uniform(0.05, 0.6, filas), 2), 0.0)
+    pago = np.round(venta * rng.uniform(0.2, 1.0, filas), 2)
+
+    return pd.DataFrame({
+        'id_socio': np.arange(desplazamiento, desplazamiento + filas, dtype=np.int64),
+        'fecha': pd.Timestamp(fecha_inicio) + pd.to_timedelta(rng.integers(0, dias, filas), unit='D'),
+        'sucursal': sucursales[rng.integers(0, n_sucursales, filas)],
+        'venta': venta,
+        'adeudo': adeudo,
+        'pago': pago,
+    })
+
+
+def generar_bloques(filas, tam_bloque=TAM_BLOQUE, semilla=0, **kwargs):
+    """
+    Genera el mismo tipo de libro en bloques de tam_bloque filas.
+    Cada bloque usa su propia semilla derivada para que el resultado sea reproducible.
+    """
+    semillas = np.random.SeedSequence(semilla).spawn((filas + tam_bloque - 1) // tam_bloque)
+    for i, semilla_bloque in enumerate(semillas):
+        inicio = i * tam_bloque
+        n = min(tam_bloque, filas - inicio)
+        yield generar_ledger(n, semilla=semilla_bloque, desplazamiento=inicio, **kwargs)
+
+
+def escribir_csv(ruta, filas, tam_bloque=TAM_BLOQUE, **kwargs):
+    """
+    Escribe el libro sintético en un CSV por bloques (sin tenerlo todo en memoria).
+    """
+    for i, bloque in enumerate(generar_bloques(filas, tam_bloque, **kwargs)):
+        bloque.to_csv(ruta, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un libro de ventas sintético en CSV")
+    parser.add_argument('ruta')
+    parser.add_argument('--filas', type=float, default=1e5)
+    parser.add_argument('--sucursales', type=int, default=25)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+    escribir_csv(args.ruta, int(args.filas), n_sucursales=args.sucursales, dias=args.dias, semilla=args.semilla)
@@ -0,0 +1,115 @@
+import pandas as pd
+from dataclasses import dataclass, field
+
+from compacto import dias_a_fechas
+
+# Patrones usados para reconocer cada tipo de columna por su nombre
+PATRONES_VENTA = ('venta', 'monto', 'total')
+PATRONES_DEUDA = ('adeudo', 'deuda', 'saldo')
+PATRONES_PAGO = ('pago', 'abono')
+PATRONES_FECHA = ('fecha', 'date')
+PATRONES_SUCURSAL = ('sucursal', 'tienda', 'local')
+
+
+def columnas_numericas(datos):
+    """
+    Columnas numéricas del DataFrame de cualquier ancho (el modo compacto reduce
+    int64 a int8/16/32), sin contar fechas guardadas como días.
+    """
+    epocas = datos.attrs.get('epocas_fecha', {})
+    return [col for col in datos.select_dtypes(include='number').columns if col not in epocas]
+
+
+def buscar_columnas(columnas, patrones):
+    """
+    Devuelve las columnas cuyo nombre contiene alguno de los patrones.
+    """
+    return [col for col in columnas if any(patron in col.lower() for patron in patrones)]
+
+
+@dataclass
+class EsquemaDatos:
+    """
+    Columnas resueltas del reporte con sus tipos finales.
+    Se construye una sola vez después de preparar_datos.
+    """
+    venta: str = None
+    deuda: str = None
+    pago: str = None
+    fecha: str = None
+    sucursal: str = None
+    venta_cols: list = field(default_factory=list)
+    sucursal_inferida: bool = False
+    tipos: dict = field(default_factory=dict)
+    fecha_epoca: pd.Timestamp = None  # Solo en modo compacto: la fecha está en días desde esta época
+
+    def fecha_es_datetime(self):
+        if self.fecha is None:
+            return False
+        return self.fecha_epoca is not None or pd.api.types.is_datetime64_dtype(self.tipos[self.fecha])
+
+
+def fechas_de(datos, esquema):
+    """
+    Columna de fecha del esquema como datetime64, aunque esté guardada en días.
+    """
+    if esquema.fecha_epoca is not None:
+        return dias_a_fechas(datos[esquema.fecha], esquema.fecha_epoca)
+    return datos[esquema.fecha]
+
+
+def resolver_esquema(datos):
+    """
+    Identifica las columnas de ventas, deuda, pagos, fecha y sucursal
+    y convierte a numérico (una sola vez) las de ventas y deuda.
+    """
+    venta_cols = buscar_columnas(datos.columns, PATRONES_VENTA)
+    deuda_cols = buscar_columnas(datos.columns, PATRONES_DEUDA)
+    fecha_cols = buscar_columnas(datos.columns, PATRONES_FECHA)
+    sucursal_cols = buscar_columnas(datos.columns, PATRONES_SUCURSAL)
+    pago_cols = buscar_columnas(datos.columns, PATRONES_PAGO)
+
+    # Conversión única de las columnas de montos
+    for col in venta_cols[:1] + deuda_cols[:1]:
+        if not pd.api.types.is_numeric_dtype(datos[col]):
+            datos[col] = pd.to_numeric(datos[col], errors='coerce')
+
+    if not pago_cols:
+        # Si no hay columnas específicas de pago, usar columnas numéricas que no sean ventas
+        pago_cols = [col for col in columnas_numericas(datos)
+                     if col not in venta_cols and 'id' not in col.lower()]
+
+    # Si no encontramos columna específica de sucursal, usar la primera categórica con menos de 20 valores
+    sucursal_inferida = False
+    if not sucursal_cols:
+        for col in datos.select_dtypes(include=['object', 'category']).columns:
+            if datos[col].nunique() < 20:
+                sucursal_cols = [col]
+                sucursal_inferida = True
+                break
+
+    return EsquemaDatos(
+        venta=venta_cols[0] if venta_cols else None,
+        deuda=deuda_cols[0] if deuda_cols else None,
+        pago=pago_cols[0] if pago_cols else None,
+        fecha=fecha_cols[0] if fecha_cols else None,
+        sucursal=sucursal_cols[0] if sucursal_cols else None,
+        venta_cols=venta_cols,
+        sucursal_inferida=sucursal_inferida,
+        tipos=datos.dtypes.to_dict(),
+        fecha_epoca=datos.attrs.get('epocas_fecha', {}).get(fecha_cols[0]) if fecha_cols else None,
+    )
+
+
+def aplicar_esquema(bloque, esquema):
+    """
+    Convierte un bloque nuevo de datos a los tipos ya resueltos en el esquema.
+    Se usa en los modos por bloques, donde el esquema se resuelve con el primer bloque.
+    """
+    for col in [esquema.venta, esquema.deuda, esquema.pago]:
+        if col and col in bloque.columns and not pd.api.types.is_numeric_dtype(bloque[col]):
+            bloque[col] = pd.to_numeric(bloque[col], errors='coerce')
+    if (esquema.fecha_es_datetime() and esquema.fecha_epoca is None
+            and not pd.api.types.is_datetime64_dtype(bloque[esquema.fecha])):
+        bloque[esquema.fecha] = pd.to_datetime(bloque[esquema.fecha], errors='coerce')
+    return bloque
@@ -0,0 +1,333 @@
+from functools import wraps
+
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Configuración para visualización
+ESTILO = 'seaborn-v0_8-colorblind'  # Esquema de colores más atractivo
+PARAMETROS = {
+    'font.size': 12,
+    'figure.figsize': (12, 8),
+    'font.weight': 'bold',
+    'axes.labelweight': 'bold',
+    'axes.titleweight': 'bold',
+    'axes.titlesize': 16
+}
+
+
+def configurar_estilo():
+    plt.style.use(ESTILO)
+    plt.rcParams.update(PARAMETROS)
+
+
+configurar_estilo()
+
+
+def cerrar_figuras(dibujo):
+    """
+    Cierra las figuras que abrió la función aunque falle: el render dibuja
+    muchas gráficas en el mismo proceso y una figura abierta pasaría a la siguiente.
+    """
+    @wraps(dibujo)
+    def envoltura(*args, **kwargs):
+        abiertas = set(plt.get_fignums())
+        try:
+            return dibujo(*args, **kwargs)
+        finally:
+            for numero in set(plt.get_fignums()) - abiertas:
+                plt.close(numero)
+    return envoltura
+
+
+@cerrar_figuras
+def dibujar_distribucion_adeudos(socios_con_adeudo, socios_sin_adeudo, porcentaje_con_adeudo,
+                                 porcentaje_sin_adeudo, ruta='distribucion_adeudos.png'):
+    """
+    Gráfico de pastel de socios con y sin adeudo.
+    """
+    labels = [f'Con adeudo\n{porcentaje_con_adeudo:.1f}%', f'Sin adeudo\n{porcentaje_sin_adeudo:.1f}%']
+    sizes = [socios_con_adeudo, socios_sin_adeudo]
+    colors = ['#ff9999', '#66b3ff']
+    explode = (0.1, 0)  # Resaltar el primer slice
+
+    plt.figure(figsize=(10, 8))
+    plt.pie(sizes, explode=explode, labels=labels, colors=colors,
+            autopct='%1.1f%%', shadow=True, startangle=90, textprops={'fontsize': 14})
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    plt.title('Distribución de Socios por Estado de Adeudo', fontsize=18)
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_ventas_mensuales(meses, ventas, ruta='ventas_mensuales.png'):
+    """
+    Barras de ventas por mes con línea de tendencia.
+    """
+    # Crear gráfica de barras con diseño mejorado
+    plt.figure(figsize=(14, 8))
+    bars = plt.bar(meses, ventas, color=sns.color_palette("viridis", len(meses)))
+
+    # Añadir etiquetas encima de las barras
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                 f'${height:,.0f}',
+                 ha='center', va='bottom', rotation=0, fontsize=10)
+
+    plt.title('Ventas Totales por Mes', fontsize=18, fontweight='bold')
+    plt.xlabel('Mes', fontsize=14)
+    plt.ylabel('Ventas ($)', fontsize=14)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+    # Añadir línea de tendencia
+    plt.plot(meses, ventas, 'ro-', alpha=0.6, linewidth=2, markersize=8)
+
+    # Guardar gráfica con alta resolución
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_top_ventas(valores, ruta='top_ventas.png'):
+    """
+    Barras horizontales de las ventas más altas.
+    """
+    plt.figure(figsize=(14, 8))
+    plt.barh(range(len(valores)), valores, color=sns.color_palette("viridis", len(valores)))
+    plt.yticks(range(len(valores)), [f"Registro {i+1}" for i in range(len(valores))])
+    plt.title('Top 20 Ventas', fontsize=18, fontweight='bold')
+    plt.xlabel('Monto ($)', fontsize=14)
+    plt.ylabel('Registros', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_desviacion_pagos(meses, medias, desviaciones, ruta='desviacion_pagos.png'):
+    """
+    Media mensual de pagos con barras de error de la desviación estándar.
+    """
+    plt.figure(figsize=(14, 8))
+
+    # Crear barras para la media
+    plt.bar(meses, medias, alpha=0.5, color='steelblue', label='Media')
+
+    # Añadir línea para la desviación estándar
+    plt.errorbar(meses, medias, yerr=desviaciones, fmt='o', color='darkred',
+                 ecolor='darkred', elinewidth=2, capsize=6, label='Desviación Estándar')
+
+    plt.title('Media y Desviación Estándar de Pagos por Mes', fontsize=18, fontweight='bold')
+    plt.xlabel('Mes', fontsize=14)
+    plt.ylabel('Valor ($)', fontsize=14)
+    plt.xticks(rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.legend(fontsize=12)
+    plt.tight_layout()
+
+    # Guardar gráfica
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_variabilidad(datos_numericos, ruta='variabilidad_datos.png'):
+    """
+    Boxplot de las columnas numéricas recibidas.
+    """
+    plt.figure(figsize=(14, 8))
+    sns.boxplot(data=datos_numericos)
+    plt.title('Distribución y Variabilidad de Valores', fontsize=18, fontweight='bold')
+    plt.xlabel('Variables', fontsize=14)
+    plt.ylabel('Valor', fontsize=14)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.tight_layout()
+
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_utilidad(ventas_totales, deuda_total, utilidad, porcentaje_utilidad, ruta='analisis_utilidad.png'):
+    """
+    Barra apilada de ventas totales menos deuda total.
+    """
+    plt.figure(figsize=(10, 6))
+    categorias = ['Resultado Financiero']
+    valores = [ventas_totales]
+
+    plt.bar(categorias, valores, label='Ventas Totales', color='#4CAF50')
+
+    if deuda_total > 0:
+        plt.bar(categorias, [-deuda_total], bottom=valores, label='Deuda Total', color='#F44336')
+
+    # Añadir etiquetas con valores
+    plt.text(0, ventas_totales/2, f'${ventas_totales:,.0f}', ha='center', va='center',
+             color='white', fontweight='bold', fontsize=12)
+
+    if deuda_total > 0:
+        plt.text(0, ventas_totales + (-deuda_total/2), f'-${deuda_total:,.0f}',
+                 ha='center', va='center', color='white', fontweight='bold', fontsize=12)
+
+    # Añadir texto de utilidad
+    plt.text(0, ventas_totales + 0.1 * ventas_totales,
+             f'Utilidad: ${utilidad:,.0f} ({porcentaje_utilidad:.1f}%)',
+             ha='center', va='bottom', fontweight='bold', fontsize=14, color='black')
+
+    plt.title('Análisis de Utilidad', fontsize=18, fontweight='bold')
+    plt.ylabel('Monto ($)', fontsize=14)
+    plt.legend(loc='lower right')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+    # Ajustar límites para que se vea bien
+    max_value = max(ventas_totales, deuda_total)
+    plt.ylim(-max_value * 0.2, ventas_totales * 1.2)
+
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_ventas_sucursal(df_sucursales, ruta='ventas_por_sucursal.png'):
+    """
+    Gráfico circular de ventas por sucursal (df con columnas Sucursal y Ventas, ya ordenado).
+    """
+    # Crear gráfico circular mejorado
+    plt.figure(figsize=(12, 10))
+
+    # Usar paleta de colores más atractiva
+    colors = plt.cm.tab20.colors
+
+    # Crear el gráfico de pastel
+    wedges, texts, autotexts = plt.pie(
+        df_sucursales['Ventas'],
+        labels=df_sucursales['Sucursal'],
+        autopct='%1.1f%%',
+        startangle=90,
+        shadow=True,
+        explode=[0.05 if i < 3 else 0 for i in range(len(df_sucursales))],  # Resaltar las 3 principales
+        colors=colors,
+        wedgeprops={'edgecolor': 'white', 'linewidth': 1.5},
+        textprops={'fontsize': 12, 'fontweight': 'bold'}
+    )
+
+    # Personalizar textos
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    plt.title('Distribución de Ventas por Sucursal', fontsize=20, fontweight='bold', pad=20)
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+
+    # Añadir leyenda separada para mejor visualización
+    plt.legend(
+        title='Sucursales',
+        loc='center left',
+        bbox_to_anchor=(1, 0, 0.5, 1),
+        fontsize=10
+    )
+
+    plt.tight_layout()
+
+    # Guardar gráfica con alta resolución
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_deudas_vs_margen(df_analisis, ruta='deudas_vs_margen_sucursal.png'):
+    """
+    Ventas, deuda y utilidad por sucursal con el margen de utilidad en un segundo eje.
+    """
+    # Definir esquema de colores
+    color_deuda = '#E57373'     # Rojo claro
+    color_utilidad = '#81C784'  # Verde claro
+    color_margen = '#5C6BC0'    # Azul
+
+    # Crear gráfico de barras apiladas con línea de margen
+    fig, ax1 = plt.subplots(figsize=(16, 10))
+
+    # Calcular posiciones de las barras
+    x = np.arange(len(df_analisis))
+    width = 0.35
+
+    # Crear barras para las ventas
+    ax1.bar(x, df_analisis['Ventas'], width, label='Ventas', color='#64B5F6', edgecolor='white', linewidth=1)
+
+    # Crear barras para las deudas (apiladas sobre las ventas)
+    ax1.bar(x, -df_analisis['Deuda'], width, bottom=df_analisis['Ventas'],
+            label='Deuda', color=color_deuda, edgecolor='white', linewidth=1)
+
+    # Crear barras para la utilidad
+    ax1.bar(x + width, df_analisis['Utilidad'], width, label='Utilidad',
+            color=color_utilidad, edgecolor='white', linewidth=1)
+
+    # Configurar primer eje
+    ax1.set_xlabel('Sucursal', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Monto ($)', fontsize=14, fontweight='bold')
+    ax1.set_title('Análisis Financiero por Sucursal', fontsize=20, fontweight='bold', pad=20)
+    ax1.set_xticks(x + width / 2)
+    ax1.set_xticklabels(df_analisis['Sucursal'], rotation=45, ha='right')
+
+    # Crear segundo eje para el margen de utilidad
+    ax2 = ax1.twinx()
+    ax2.plot(x + width/2, df_analisis['Margen_Utilidad'], 'o-', linewidth=3,
+             markersize=10, color=color_margen, label='Margen de Utilidad (%)')
+    ax2.set_ylabel('Margen de Utilidad (%)', fontsize=14, fontweight='bold', color=color_margen)
+    ax2.tick_params(axis='y', colors=color_margen)
+
+    # Añadir etiquetas a los puntos de margen
+    for i, valor in enumerate(df_analisis['Margen_Utilidad']):
+        ax2.annotate(f'{valor:.1f}%', (x[i] + width/2, valor),
+                     xytext=(0, 10), textcoords='offset points',
+                     ha='center', va='bottom', fontweight='bold', color=color_margen)
+
+    # Añadir cuadrícula
+    ax1.grid(axis='y', linestyle='--', alpha=0.3)
+
+    # Combinar las leyendas de ambos ejes
+    handles1, labels1 = ax1.get_legend_handles_labels()
+    handles2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(handles1 + handles2, labels1 + labels2, loc='upper center',
+               bbox_to_anchor=(0.5, -0.15), ncol=4, fontsize=12, frameon=True)
+
+    # Ajustar diseño
+    plt.tight_layout()
+
+    # Guardar gráfica con alta resolución
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_sucursal_alternativa(valores, titulo, ruta='analisis_alternativo_sucursal.png'):
+    """
+    Barras horizontales de ventas o deudas por sucursal.
+    """
+    plt.figure(figsize=(14, 8))
+
+    # Generar gráfico de barras horizontal
+    plt.barh(valores.index, valores, color=plt.cm.viridis(np.linspace(0, 1, len(valores))))
+
+    # Añadir valores al final de cada barra
+    for i, v in enumerate(valores):
+        plt.text(v + 0.01*max(valores), i, f'${v:,.0f}', va='center', fontweight='bold')
+
+    plt.title(titulo, fontsize=18, fontweight='bold')
+    plt.xlabel('Monto ($)', fontsize=14)
+    plt.ylabel('Sucursal', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+
+    plt.savefig(ruta, dpi=300, bbox_inches='tight')
+
+
+@cerrar_figuras
+def dibujar_ventas_sucursal_simple(valores, ruta='ventas_sucursal_simple.png'):
+    """
+    Gráfica simplificada de ventas por sucursal.
+    """
+    plt.figure(figsize=(12, 8))
+    plt.bar(valores.index, valores, color='darkblue')
+    plt.title('Ventas por Sucursal', fontsize=16)
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(ruta, dpi=300)
@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from agregados import agregados_desde_parciales, calcular_parciales, fusionar_parciales
+from esquema import fechas_de
+
+RUTA_ESTADO = 'estado_reporte.pkl'
+VERSION_ESTADO = 1
+
+
+def firma_esquema(datos, esquema):
+    """
+    Columnas del archivo y columnas resueltas; si cambian, el estado no sirve.
+    """
+    return {
+        'columnas': [str(c) for c in datos.columns],
+        'venta': esquema.venta,
+        'deuda': esquema.deuda,
+        'pago': esquema.pago,
+        'fecha': esquema.fecha,
+        'sucursal': esquema.sucursal,
+    }
+
+
+def checksums_por_mes(datos, esquema):
+    """
+    Suma (módulo 2^64) de los hashes de cada fila, agrupada por mes.
+    Es independiente del orden y se puede actualizar sumando filas nuevas.
+    Las filas sin fecha se agrupan en la clave 'NaT'.
+    """
+    hashes = pd.util.hash_pandas_object(datos, index=False)
+    meses = fechas_de(datos, esquema).dt.to_period('M').astype(str)
+    return {mes: int(valor) for mes, valor in hashes.groupby(meses.to_numpy()).sum().items()}
+
+
+def sumar_checksums(a, b):
+    resultado = dict(a)
+    for mes, valor in b.items():
+        resultado[mes] = (resultado.get(mes, 0) + valor) % (1 << 64)
+    return resultado
+
+
+def cargar_estado(ruta=RUTA_ESTADO):
+    if not os.path.exists(ruta):
+        return None
+    try:
+        estado = pd.read_pickle(ruta)
+    except Exception as e:
+        print(f"No se pudo leer el estado incremental ({e}); se reconstruye.")
+        return None
+    return estado if estado.get('version') == VERSION_ESTADO else None
+
+
+def guardar_estado(estado, ruta=RUTA_ESTADO):
+    temporal = ruta + '.tmp'
+    pd.to_pickle(estado, temporal)
+    os.replace(temporal, ruta)
+
+
+def reconstruir_estado(datos, esquema):
+    """
+    Estado completo a partir de todas las filas.
+    """
+    fechas = fechas_de(datos, esquema)
+    return {
+        'version': VERSION_ESTADO,
+        'esquema': firma_esquema(datos, esquema),
+        'marca_agua': fechas.max(),
+        'checksums': checksums_por_mes(datos, esquema),
+        'parciales': calcular_parciales(datos, esquema),
+    }
+
+
+def motivo_reconstruccion(estado, datos, esquema, verificar):
+    """
+    Devuelve por qué no se puede usar el estado guardado, o None si sirve.
+    """
+    if estado is None:
+        return "no hay estado previo"
+    if estado['esquema'] != firma_esquema(datos, esquema):
+        return "cambiaron las columnas del archivo"
+    if pd.isna(estado['marca_agua']):
+        return "el estado no tiene marca de agua"
+
+    if verificar:
+        # Las filas hasta la marca de agua (y las sin fecha) deben seguir idénticas
+        fechas = fechas_de(datos, esquema)
+        previas = datos[~(fechas > estado['marca_agua'])]
+        actuales = checksums_por_mes(previas, esquema)
+        cambiados = sorted(mes for mes in set(actuales) | set(estado['checksums'])
+                           if actuales.get(mes) != estado['checksums'].get(mes))
+        if cambiados:
+            return f"cambiaron meses ya procesados: {', '.join(cambiados)}"
+    return None
+
+
+def agregados_incrementales(datos, esquema, ruta_estado=RUTA_ESTADO, verificar=True):
+    """
+    Agregados del reporte procesando solo las filas posteriores a la marca de agua
+    guardada en ruta_estado, y fusionándolas con los parciales guardados.
+    Reconstruye todo si el estado no existe, cambió el esquema o (con verificar=True)
+    cambió el checksum de algún mes ya procesado.
+    """
+    if not esquema.fecha_es_datetime():
+        print("   Sin columna de fecha: el modo incremental procesa todo el historial.")
+        return agregados_desde_parciales(calcular_parciales(datos, esquema), esquema)
+
+    estado = cargar_estado(ruta_estado)
+    motivo = motivo_reconstruccion(estado, datos, esquema, verificar)
+
+    if motivo:
+        print(f"   Reconstrucción completa del estado incremental: {motivo}.")
+        estado = reconstruir_estado(datos, esquema)
+    else:
+        fechas = fechas_de(datos, esquema)
+        nuevas = datos[fechas > estado['marca_agua']]
+        print(f"   Modo incremental: {len(nuevas):,} filas nuevas de {len(datos):,} "
+              f"(marca de agua {estado['marca_agua']})")
+        if len(nuevas):
+            estado['parciales'] = fusionar_parciales(estado['parciales'], calcular_parciales(nuevas, esquema))
+            estado['checksums'] = sumar_checksums(estado['checksums'], checksums_por_mes(nuevas, esquema))
+            estado['marca_agua'] = fechas[fechas > estado['marca_agua']].max()
+
+    guardar_estado(estado, ruta_estado)
+    return agregados_desde_parciales(estado['parciales'], esquema)
@@ -0,0 +1,148 @@
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows no tiene el módulo resource
+    resource = None
+
+
+def rss_maximo_kb():
+    """
+    Pico de memoria residente del proceso en KB (None si no se puede medir).
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def contar_filas(obj):
+    """
+    Filas de un DataFrame/Series, o la suma de las filas de una tupla de ellos.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, (tuple, list)):
+        conteos = [contar_filas(x) for x in obj]
+        conteos = [c for c in conteos if c is not None]
+        return sum(conteos) if conteos else None
+    return None
+
+
+class Traza:
+    """
+    Registra tiempo de reloj, tiempo de CPU, memoria y filas de cada etapa.
+    Cada etapa se escribe como una línea JSON en ruta (si se indica).
+    """
+
+    # Traza que está midiendo una etapa ahora (ver registrar_error)
+    activa = None
+
+    def __init__(self, ruta=None, usar_tracemalloc=False):
+        self.ruta = ruta
+        self.usar_tracemalloc = usar_tracemalloc
+        self.registros = []
+        # Errores atrapados por cada etapa en curso (una lista por nivel de medir)
+        self.errores_etapa = []
+        if ruta:
+            # Una traza nueva por corrida
+            open(ruta, 'w', encoding='utf-8').close()
+        if usar_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def medir(self, etapa, funcion, *args, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) registrando sus métricas y devuelve su resultado.
+        Las filas de entrada son las del DataFrame más grande de los argumentos.
+        """
+        filas_entrada = max((len(a) for a in args if isinstance(a, pd.DataFrame)), default=None)
+        rss_inicio = rss_maximo_kb()
+        if self.usar_tracemalloc:
+            tracemalloc.reset_peak()
+            memoria_inicio, _ = tracemalloc.get_traced_memory()
+        inicio = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        error = None
+        resultado = None
+        anterior, Traza.activa = Traza.activa, self
+        self.errores_etapa.append([])
+        try:
+            resultado = funcion(*args, **kwargs)
+            return resultado
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            Traza.activa = anterior
+            atrapados = self.errores_etapa.pop()
+            error = error or '; '.join(atrapados) or None
+            registro = {
+                'etapa': etapa,
+                'inicio': inicio,
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': time.process_time() - cpu,
+                'rss_max_kb': rss_maximo_kb(),
+                'rss_delta_kb': None,
+                'filas_entrada': filas_entrada,
+                'filas_salida': contar_filas(resultado),
+            }
+            if rss_inicio is not None:
+                registro['rss_delta_kb'] = registro['rss_max_kb'] - rss_inicio
+            if self.usar_tracemalloc:
+                memoria_fin, pico = tracemalloc.get_traced_memory()
+                registro['tracemalloc_delta_kb'] = (memoria_fin - memoria_inicio) / 1024
+                registro['tracemalloc_pico_kb'] = (pico - memoria_inicio) / 1024
+            if error:
+                registro['error'] = error
+            self.registrar(registro)
+
+    def error(self, e):
+        """
+        Marca con error la etapa en curso aunque la función no lance la excepción.
+        """
+        if self.errores_etapa:
+            self.errores_etapa[-1].append(f"{type(e).__name__}: {e}")
+
+    def registrar(self, registro):
+        self.registros.append(registro)
+        if self.ruta:
+            with open(self.ruta, 'a', encoding='utf-8') as archivo:
+                archivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    def resumen(self):
+        """
+        Imprime una tabla con las etapas ordenadas por tiempo de reloj.
+        """
+        if not self.registros:
+            return
+        tabla = pd.DataFrame(self.registros)
+        # La etapa de render contiene a las gráficas, que se registran por separado
+        tabla = tabla[tabla['etapa'] != 'renderizar_graficas']
+        columnas = ['etapa', 'wall_s', 'cpu_s', 'rss_max_kb', 'rss_delta_kb', 'filas_entrada', 'filas_salida']
+        if self.usar_tracemalloc:
+            columnas.append('tracemalloc_pico_kb')
+        if 'error' in tabla:
+            tabla['error'] = tabla['error'].fillna('')
+            columnas.append('error')
+        tabla = tabla[columnas].sort_values('wall_s', ascending=False)
+        tabla['%'] = tabla['wall_s'] / tabla['wall_s'].sum() * 100
+        for col in ['rss_max_kb', 'rss_delta_kb', 'filas_entrada', 'filas_salida']:
+            tabla[col] = tabla[col].astype('Int64')
+
+        print("\n" + "=" * 80)
+        print("RESUMEN DE TIEMPOS POR ETAPA")
+        print("=" * 80)
+        print(tabla.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+def registrar_error(e):
+    """
+    Los pasos de analisis.py atrapan sus errores e imprimen un mensaje;
+    con esto el error queda también en la etapa que se está midiendo.
+    """
+    if Traza.activa is not None:
+        Traza.activa.error(e)
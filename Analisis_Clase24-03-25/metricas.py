@@ -0,0 +1,112 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from cache_excel import leer_excel_cacheado
+from esquema import resolver_esquema
+from agregados import calcular_agregados, margen_por_sucursal
+from streaming import preparar_primer_bloque
+
+# Este módulo no importa matplotlib ni seaborn: solo calcula números.
+
+
+def a_json(valor):
+    """
+    Convierte escalares de NumPy/pandas a tipos de JSON (NaN -> null).
+    """
+    if valor is None:
+        return None
+    valor = valor.item() if isinstance(valor, np.generic) else valor
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+def calcular_metricas(ruta='proyecto1.xlsx', usar_cache=True):
+    """
+    Métricas del reporte como diccionario listo para JSON:
+    ventas totales, socios con/sin adeudo, deuda total, utilidad y margen por sucursal.
+    """
+    if usar_cache:
+        proyecto1, _, _ = leer_excel_cacheado(ruta)
+    else:
+        import pandas as pd
+        proyecto1 = pd.read_excel(ruta)
+
+    datos = preparar_primer_bloque(proyecto1)
+    esquema = resolver_esquema(datos)
+    agregados = calcular_agregados(datos, esquema)
+
+    ventas_totales = agregados.ventas_totales if esquema.venta else 0
+    deuda_total = agregados.deuda_total if esquema.deuda else 0
+    utilidad = ventas_totales - deuda_total
+    porcentaje_utilidad = (utilidad / ventas_totales) * 100 if ventas_totales > 0 else 0
+
+    margenes = {}
+    if agregados.ventas_sucursal is not None and agregados.deudas_sucursal is not None:
+        utilidad_sucursal, margen = margen_por_sucursal(agregados)
+        for sucursal in margen.index:
+            margenes[str(a_json(sucursal))] = {
+                'ventas': a_json(agregados.ventas_sucursal[sucursal]),
+                'deuda': a_json(agregados.deudas_sucursal[sucursal]),
+                'utilidad': a_json(utilidad_sucursal[sucursal]),
+                'margen_utilidad': a_json(margen[sucursal]),
+            }
+
+    return {
+        'filas': agregados.filas,
+        'columnas': {
+            'venta': esquema.venta,
+            'deuda': esquema.deuda,
+            'pago': esquema.pago,
+            'fecha': esquema.fecha,
+            'sucursal': esquema.sucursal,
+        },
+        'ventas_totales': a_json(ventas_totales),
+        'socios_con_adeudo': agregados.socios_con_adeudo if esquema.deuda else 0,
+        'socios_sin_adeudo': agregados.socios_sin_adeudo if esquema.deuda else 0,
+        'deuda_total': a_json(deuda_total),
+        'utilidad': a_json(utilidad),
+        'porcentaje_utilidad': a_json(porcentaje_utilidad),
+        'sucursales': margenes,
+    }
+
+
+def medir_arranque(repeticiones=3):
+    """
+    Tiempo de importación en un intérprete nuevo para el modo de métricas
+    y para el modo con gráficas (el mejor de varias repeticiones).
+    """
+    modos = {
+        'metricas': 'import metricas',
+        'graficas': 'import analisis, graficas',
+    }
+    resultado = {}
+    for modo, codigo in modos.items():
+        tiempos = []
+        for _ in range(repeticiones):
+            script = f"import time; t = time.perf_counter(); {codigo}; print(time.perf_counter() - t)"
+            salida = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+            tiempos.append(float(salida.stdout.strip()))
+        resultado[modo] = min(tiempos)
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Métricas del reporte en JSON, sin gráficas")
+    parser.add_argument('ruta', nargs='?', default='proyecto1.xlsx')
+    parser.add_argument('--sin-cache', action='store_true', help="Leer el Excel sin usar el snapshot")
+    parser.add_argument('--medir-arranque', action='store_true',
+                        help="Incluir el tiempo de importación de ambos modos")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    metricas = calcular_metricas(args.ruta, usar_cache=not args.sin_cache)
+    metricas['segundos'] = time.perf_counter() - inicio
+    if args.medir_arranque:
+        metricas['arranque_segundos'] = medir_arranque()
+    print(json.dumps(metricas, ensure_ascii=False, indent=2))
@@ -0,0 +1,134 @@
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def dibujar(tareas, funcion, *args, mensaje=None, error=None, **kwargs):
+    """
+    Dibuja de inmediato la gráfica (tareas=None) o la agrega a la lista
+    de tareas para la etapa de render en paralelo.
+    funcion es el nombre de una función dibujar_* de graficas.py.
+    mensaje se imprime solo cuando el archivo quedó escrito; si la gráfica
+    diferida falla se imprime "error: detalle" (al dibujar de inmediato el
+    error llega al except del paso que la pidió).
+    """
+    if tareas is None:
+        ejecutar_tarea((funcion, args, kwargs))
+        if mensaje:
+            print(mensaje)
+    else:
+        tareas.append((funcion, args, kwargs, mensaje, error))
+
+
+def ruta_de(funcion, args, kwargs):
+    """
+    Archivo que escribe la función de graficas.py (su parámetro ruta).
+    """
+    argumentos = inspect.signature(funcion).bind(*args, **kwargs)
+    argumentos.apply_defaults()
+    return argumentos.arguments.get('ruta')
+
+
+def firma_archivo(ruta):
+    try:
+        info = os.stat(ruta)
+        return info.st_size, info.st_mtime_ns
+    except OSError:
+        return None
+
+
+def ejecutar_tarea(tarea):
+    """
+    Ejecuta una tarea (funcion, args, kwargs, ...) de graficas.py y verifica
+    que el archivo de la gráfica se haya escrito.
+    Devuelve las métricas de la tarea medidas en el proceso que la dibujó.
+    """
+    import graficas
+    from instrumentacion import rss_maximo_kb
+
+    funcion, args, kwargs = tarea[:3]
+    dibujo = getattr(graficas, funcion)
+    ruta = ruta_de(dibujo, args, kwargs)
+    antes = firma_archivo(ruta) if ruta else None
+    inicio = time.time()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    dibujo(*args, **kwargs)
+    if ruta and firma_archivo(ruta) in (None, antes):
+        raise RuntimeError(f"No se escribió el archivo {ruta}")
+    return {
+        'etapa': funcion,
+        'inicio': inicio,
+        'wall_s': time.perf_counter() - wall,
+        'cpu_s': time.process_time() - cpu,
+        'rss_max_kb': rss_maximo_kb(),
+        'rss_delta_kb': None,
+        'filas_entrada': None,
+        'filas_salida': None,
+        'pid': os.getpid(),
+    }
+
+
+def reportar(tarea, metricas=None, excepcion=None, traza=None):
+    """
+    Imprime el resultado de una tarea diferida y lo registra en la traza.
+    """
+    funcion, _, _, mensaje, error = tarea
+    if excepcion is None:
+        if mensaje:
+            print(mensaje)
+        if traza:
+            traza.registrar(metricas)
+        return
+    print(f"{error or f'Error al dibujar {funcion}'}: {excepcion}")
+    if traza:
+        traza.registrar({'etapa': funcion, 'error': f"{type(excepcion).__name__}: {excepcion}"})
+
+
+def inicializar_trabajador():
+    """
+    Los procesos del pool dibujan sin pantalla con el backend Agg.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def renderizar_graficas(tareas, trabajadores=None, traza=None):
+    """
+    Dibuja las tareas pendientes en un pool de procesos.
+    trabajadores=None usa un proceso por núcleo (sin pasar del número de tareas);
+    con un solo trabajador se dibuja en serie, sin pagar el arranque del pool.
+    Los errores se reportan por gráfica sin detener las demás; el mensaje de
+    cada gráfica se imprime solo después de confirmar que su archivo se escribió.
+    Si se pasa una Traza, se registra el tiempo de cada gráfica.
+    """
+    inicio = time.perf_counter()
+    errores = 0
+    if trabajadores is None:
+        trabajadores = min(len(tareas), os.cpu_count() or 1)
+
+    if trabajadores <= 1 or len(tareas) <= 1:
+        for tarea in tareas:
+            try:
+                metricas = ejecutar_tarea(tarea)
+            except Exception as e:
+                errores += 1
+                reportar(tarea, excepcion=e, traza=traza)
+            else:
+                reportar(tarea, metricas, traza=traza)
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=inicializar_trabajador) as pool:
+            futuros = [pool.submit(ejecutar_tarea, tarea) for tarea in tareas]
+            # Se recorren en el orden original para reportar de forma determinista
+            for tarea, futuro in zip(tareas, futuros):
+                try:
+                    metricas = futuro.result()
+                except Exception as e:
+                    errores += 1
+                    reportar(tarea, excepcion=e, traza=traza)
+                else:
+                    reportar(tarea, metricas, traza=traza)
+
+    print(f"\nGráficas dibujadas: {len(tareas) - errores} de {len(tareas)} "
+          f"en {time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,134 @@
+import argparse
+import os
+
+import pandas as pd
+
+from esquema import PATRONES_FECHA, aplicar_esquema, buscar_columnas, resolver_esquema
+from agregados import agregados_desde_parciales, calcular_parciales, fusionar_parciales, margen_por_sucursal
+
+TAM_BLOQUE = 100_000
+
+
+def leer_excel_por_bloques(ruta, tam_bloque=TAM_BLOQUE):
+    """
+    Lee un libro de Excel en modo solo lectura, tam_bloque filas a la vez.
+    """
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        # Mismo nombre que pd.read_excel para columnas sin encabezado
+        columnas = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(encabezado)]
+
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) >= tam_bloque:
+                yield pd.DataFrame(bloque, columns=columnas)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, columns=columnas)
+    finally:
+        libro.close()
+
+
+def leer_por_bloques(ruta, tam_bloque=TAM_BLOQUE):
+    """
+    Devuelve un iterador de DataFrames de a lo más tam_bloque filas (CSV o Excel).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        return pd.read_csv(ruta, chunksize=tam_bloque)
+    if extension in ('.xlsx', '.xlsm'):
+        return leer_excel_por_bloques(ruta, tam_bloque)
+    raise ValueError(f"Formato no soportado para lectura por bloques: {extension}")
+
+
+def preparar_primer_bloque(bloque):
+    """
+    Conversión de fechas equivalente a preparar_datos, sin mensajes.
+    """
+    for col in buscar_columnas(bloque.columns, PATRONES_FECHA):
+        bloque[col] = pd.to_datetime(bloque[col], errors='coerce')
+    return bloque
+
+
+def acumular_por_bloques(bloques):
+    """
+    Recorre los bloques acumulando parciales (sucursal, mes) mezclables.
+    Solo un bloque está en memoria a la vez. Devuelve (esquema, parciales).
+    """
+    esquema = None
+    parciales = None
+    for bloque in bloques:
+        if esquema is None:
+            # El esquema se resuelve una vez con el primer bloque
+            esquema = resolver_esquema(preparar_primer_bloque(bloque))
+        else:
+            aplicar_esquema(bloque, esquema)
+        parciales = fusionar_parciales(parciales, calcular_parciales(bloque, esquema))
+    return esquema, parciales
+
+
+def calcular_agregados_streaming(ruta, tam_bloque=TAM_BLOQUE):
+    """
+    Calcula los mismos agregados que el modo en memoria leyendo por bloques.
+    """
+    esquema, parciales = acumular_por_bloques(leer_por_bloques(ruta, tam_bloque))
+    if esquema is None:
+        return None, None
+    return esquema, agregados_desde_parciales(parciales, esquema)
+
+
+def generar_reporte_streaming(ruta='proyecto1.xlsx', tam_bloque=TAM_BLOQUE):
+    """
+    Reporte numérico para libros que no caben en memoria.
+    """
+    print("=" * 80)
+    print(f"REPORTE POR BLOQUES ({tam_bloque:,} filas por bloque): {ruta}")
+    print("=" * 80)
+
+    try:
+        esquema, agregados = calcular_agregados_streaming(ruta, tam_bloque)
+    except Exception as e:
+        print(f"Error al procesar los datos por bloques: {e}")
+        return None
+
+    if agregados is None:
+        print("El archivo no contiene datos.")
+        return None
+
+    total_socios = agregados.socios_con_adeudo + agregados.socios_sin_adeudo
+    print(f"\nFilas procesadas: {agregados.filas:,}")
+    print(f"\n1. VENTAS TOTALES DEL COMERCIO: ${agregados.ventas_totales:,.2f}")
+    print(f"\n2. ANÁLISIS DE ADEUDOS DE SOCIOS:")
+    print(f"   - Socios con adeudo: {agregados.socios_con_adeudo}")
+    print(f"   - Socios sin adeudo: {agregados.socios_sin_adeudo}")
+    print(f"   - Total de socios: {total_socios}")
+
+    if agregados.pagos_mes is not None:
+        print(f"\n4. DESVIACIÓN ESTÁNDAR DE PAGOS POR MES:")
+        for mes, fila in agregados.pagos_mes.iterrows():
+            print(f"   - {mes}: media ${fila['mean']:,.2f}, desviación ${fila['std']:,.2f}")
+
+    print(f"\n5. DEUDA TOTAL DE LOS CLIENTES: ${agregados.deuda_total:,.2f}")
+
+    if agregados.ventas_sucursal is not None and agregados.deudas_sucursal is not None:
+        _, margen = margen_por_sucursal(agregados)
+        print(f"\n8. MARGEN DE UTILIDAD POR SUCURSAL:")
+        for sucursal, valor in margen.sort_values(ascending=False).items():
+            print(f"   - {sucursal}: {valor:.2f}%")
+
+    return agregados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reporte de ventas y adeudos por bloques")
+    parser.add_argument('ruta', nargs='?', default='proyecto1.xlsx')
+    parser.add_argument('--tam-bloque', type=int, default=TAM_BLOQUE)
+    args = parser.parse_args()
+    generar_reporte_streaming(args.ruta, args.tam_bloque)
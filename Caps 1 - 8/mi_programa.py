@@ -1,12 +1,15 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import random
 import seaborn as sns
 
-tirosdados = [random.randrange(1, 7) for i in range(600)]
-valores, frecuencias= np.unique(tirosdados, return_counts=True)
+# Tiros con numpy.random.Generator en un solo arreglo; para millones de tiros
+# está contar_dados en ElementosBasicosEstadistica/simulacion.py (por lotes)
+n_tiros = 600
+tiros = np.random.default_rng().integers(1, 7, n_tiros)
+frecuencias = np.bincount(tiros, minlength=7)[1:]
+valores = np.arange(1, len(frecuencias) + 1)
 
-titulo = f'Resultados de tirar los dados {len(tirosdados)} veces'
+titulo = f'Resultados de tirar los dados {n_tiros} veces'
 
 sns.set_style('whitegrid')
 axes = sns.barplot(x=valores, y=frecuencias, palette = 'bright')
@@ -18,7 +21,7 @@ axes.set_ylim(top=max(frecuencias)*1.10)
 for bar, frecuencias in zip(axes.patches, frecuencias):
     text_x=bar.get_x()+bar.get_width()/2.0
     text_y=bar.get_height()
-    text= f'{frecuencias:,}\n{frecuencias/len(tirosdados):.3%}'
+    text= f'{frecuencias:,}\n{frecuencias/n_tiros:.3%}'
 
     axes.text(text_x, text_y, text, fontsize=11, ha='center', va='bottom')
 
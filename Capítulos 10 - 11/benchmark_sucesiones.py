@@ -0,0 +1,116 @@
+import argparse
+import sys
+import timeit
+
+import pandas as pd
+
+from sucesiones import factoriales, fibonacci, fibonacci_lote, series_geometricas
+
+# Las versiones del cuaderno 11 (recursivas) llegan hasta el límite de recursión
+sys.setrecursionlimit(10_000)
+A, R = 3, 1 / 2
+
+
+def fibonacci_recursivo(n):
+    if n <= 1:
+        return n
+    return fibonacci_recursivo(n-1) + fibonacci_recursivo(n-2)
+
+
+def fibonacci_iterativo(n):
+    resultado = 0
+    temp = 1
+    for j in range(0, n):
+        temp, resultado = resultado, resultado + temp
+    return resultado
+
+
+def factorial_recursivo(n):
+    if n <= 1:
+        return 1
+    return n*factorial_recursivo(n-1)
+
+
+def serie_geom(n):
+    if n == 0:
+        return n
+    else:
+        return serie_geom (n-1) + A * R ** (n-1)
+
+
+def medir(funcion):
+    """
+    Segundos por llamada, como %timeit: repite hasta juntar al menos 0.2 s
+    y toma la mejor de 3 rondas.
+    """
+    temporizador = timeit.Timer(funcion)
+    veces, _ = temporizador.autorange()
+    return min(temporizador.repeat(3, veces)) / veces
+
+
+def fila(prueba, n, antes, despues):
+    return {'prueba': prueba, 'n': n, 'antes_ms': None if antes is None else antes * 1000,
+            'despues_ms': despues * 1000, 'aceleracion': None if antes is None else antes / despues}
+
+
+def comparar_fibonacci(ns, max_recursivo, max_iterativo):
+    """
+    fibonacci_recursivo (o fibonacci_iterativo cuando n es grande) contra duplicación rápida.
+    """
+    filas = []
+    for n in ns:
+        assert n > 40 or fibonacci(n) == fibonacci_iterativo(n)
+        if n <= max_recursivo:
+            filas.append(fila('fibonacci recursivo', n, medir(lambda: fibonacci_recursivo(n)),
+                              medir(lambda: fibonacci(n))))
+        antes = medir(lambda: fibonacci_iterativo(n)) if n <= max_iterativo else None
+        filas.append(fila('fibonacci iterativo', n, antes, medir(lambda: fibonacci(n))))
+    return filas
+
+
+def comparar_rangos(ns, max_bucle):
+    """
+    Los bucles del cuaderno (cada n recalcula todo desde 1) contra las versiones por lote.
+    """
+    filas = []
+    for n in ns:
+        rango = range(1, n + 1)
+        assert n > max_bucle or factoriales(rango) == [factorial_recursivo(i) for i in rango]
+        antes = medir(lambda: [factorial_recursivo(i) for i in rango]) if n <= max_bucle else None
+        filas.append(fila('for factorial(i)', n, antes, medir(lambda: factoriales(rango))))
+
+        antes = medir(lambda: [fibonacci_iterativo(i) for i in rango]) if n <= max_bucle else None
+        filas.append(fila('for fibonacci(i)', n, antes, medir(lambda: fibonacci_lote(rango))))
+    return filas
+
+
+def comparar_geometricas(ns, max_bucle):
+    """
+    for n: serie_geom(n) (recursiva) contra la forma cerrada sobre todo el rango con numpy.
+    """
+    filas = []
+    for n in ns:
+        rango = range(1, n + 1)
+        antes = medir(lambda: [serie_geom(i) for i in rango]) if n <= max_bucle else None
+        filas.append(fila('for serie_geom(i)', n, antes, medir(lambda: series_geometricas(A, R, rango))))
+    return filas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparaciones de %timeit del cuaderno 11, extendidas")
+    parser.add_argument('--fibonacci', type=int, nargs='+',
+                        default=[32, 33, 34, 1_000, 100_000, 1_000_000, 10_000_000])
+    # Los factoriales y Fibonacci de todo un rango ocupan memoria que crece como n²
+    parser.add_argument('--rangos', type=int, nargs='+', default=[20, 500, 5_000])
+    parser.add_argument('--geometricas', type=int, nargs='+', default=[9, 500, 1_000_000, 10_000_000])
+    parser.add_argument('--max-recursivo', type=int, default=34,
+                        help="n más grande para fibonacci_recursivo (crece como 1.6^n)")
+    parser.add_argument('--max-iterativo', type=int, default=100_000)
+    parser.add_argument('--max-bucle', type=int, default=500,
+                        help="n más grande para los bucles recursivos del cuaderno (crecen como n²)")
+    args = parser.parse_args()
+
+    filas = comparar_fibonacci(args.fibonacci, args.max_recursivo, args.max_iterativo)
+    filas += comparar_rangos(args.rangos, args.max_bucle)
+    filas += comparar_geometricas(args.geometricas, args.max_bucle)
+    print(pd.DataFrame(filas).to_string(index=False, na_rep='-', float_format=lambda v: f"{v:,.4f}"))
@@ -0,0 +1,119 @@
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+# Cuántos resultados recuerda cada función memoizada (los factoriales grandes ocupan mucho)
+TAM_CACHE = 1024
+# Si el siguiente n está más cerca que esto se avanza sumando en lugar de duplicar
+SALTO_MAXIMO = 64
+
+
+def fibonacci_par(n):
+    """
+    (F(n), F(n+1)) por duplicación rápida, recorriendo los bits de n:
+    F(2k) = F(k) * (2 F(k+1) - F(k)),  F(2k+1) = F(k)² + F(k+1)².
+    Son O(log n) pasos en lugar de los n de la versión iterativa.
+    """
+    if n < 0:
+        raise ValueError("n debe ser mayor o igual a 0")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == '1' else (c, d)
+    return a, b
+
+
+def fibonacci(n):
+    return fibonacci_par(n)[0]
+
+
+def fibonacci_lote(ns):
+    """
+    F(n) para cada n de una lista (o un range), en el mismo orden. Se recorren los n
+    de menor a mayor: los cercanos se alcanzan sumando desde el anterior y los
+    lejanos se calculan con duplicación rápida.
+    """
+    ns = list(ns)
+    resultados = {}
+    actual, a, b = None, 0, 1
+    for n in sorted(set(ns)):
+        if actual is None or n - actual > SALTO_MAXIMO:
+            a, b = fibonacci_par(n)
+        else:
+            for _ in range(n - actual):
+                a, b = b, a + b
+        actual = n
+        resultados[n] = a
+    return [resultados[n] for n in ns]
+
+
+@lru_cache(maxsize=TAM_CACHE)
+def factorial(n):
+    """
+    n! memoizado (los últimos TAM_CACHE valores distintos).
+    """
+    return math.factorial(n)
+
+
+def factoriales(ns):
+    """
+    n! para cada n de una lista (o un range): se ordenan y cada factorial sale
+    del anterior multiplicando solo los factores que faltan, sin recalcular prefijos.
+    """
+    ns = list(ns)
+    resultados = {}
+    actual, valor = 0, 1
+    for n in sorted(set(ns)):
+        if n < 0:
+            raise ValueError("n debe ser mayor o igual a 0")
+        if n - actual > SALTO_MAXIMO:
+            valor = factorial(n)
+        else:
+            for k in range(actual + 1, n + 1):
+                valor *= k
+        actual = n
+        resultados[n] = valor
+    return [resultados[n] for n in ns]
+
+
+# typed=True: 3, 3.0 y Fraction(3) no comparten resultado (exacto o flotante)
+@lru_cache(maxsize=TAM_CACHE, typed=True)
+def serie_geometrica(a, r, n):
+    """
+    a + a r + ... + a r^(n-1) en forma cerrada: a (1 - r^n) / (1 - r), o a n si r = 1.
+    Con a y r enteros (o Fraction) el resultado es exacto.
+    """
+    if n < 0:
+        raise ValueError("n debe ser mayor o igual a 0")
+    if r == 1:
+        return a * n
+    if isinstance(a, int) and isinstance(r, int):
+        # 1 - r^n siempre es divisible entre 1 - r: la división entera es exacta
+        return a * ((1 - r ** n) // (1 - r))
+    return a * (1 - r ** n) / (1 - r)
+
+
+def series_geometricas(a, r, ns):
+    """
+    serie_geometrica para un arreglo de n de una sola vez con numpy (en punto flotante).
+    """
+    ns = np.asarray(ns)
+    if r == 1:
+        return a * ns.astype(np.float64)
+    return a * (1 - np.power(float(r), ns)) / (1 - r)
+
+
+def sumas_parciales(a, r, n):
+    """
+    Las n sumas parciales S(1) .. S(n) de forma exacta, cada una a partir de la anterior.
+    """
+    a, r = Fraction(a), Fraction(r)
+    sumas, suma, termino = [], Fraction(0), a
+    for _ in range(n):
+        suma += termino
+        termino *= r
+        sumas.append(suma)
+    return sumas
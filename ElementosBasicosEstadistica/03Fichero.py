@@ -1,11 +1,12 @@
 import pandas as pd
 
-def resumen_cotizacion(fichero):
-    df = pd.read_csv(fichero, sep=';', decimal='.', thousands='.', index_col=0)
+from cotizaciones import leer_cotizacion
+from estadisticas import estados_de, tabla_resumen
 
-    df = df.apply(pd.to_numeric, errors='coerce')
+def resumen_cotizacion(fichero):
+    # Números en formato europeo: decimal y miles detectados por columna
+    df = leer_cotizacion(fichero, sep=';', index_col=0)
 
-    return pd.DataFrame([df.min(), df.max(), df.mean(), df.std()],
-                        index=['Min', 'Max', 'Media', 'Desviación Estándar'])
+    return tabla_resumen(estados_de(df, con_conteos=False))
 
 print(resumen_cotizacion('cotizacion.csv'))
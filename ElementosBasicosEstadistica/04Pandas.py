@@ -1,6 +1,11 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-df = pd.read_csv('housing.csv')
+
+from cache_columnas import cargar_columnas
+from consultas import IndiceVivienda
+
+# Columnas mapeadas desde la caché (ocean_proximity como categórica)
+df = cargar_columnas('housing.csv')
 
 ##Mostrar las primeras 5 filas
 print(df.head())
@@ -26,7 +31,9 @@ salariototal = df["population"].sum()
 print('El salario total es: ', salariototal)
 
 ##Para poder filtrar
-vamosahacerunfiltro = df[df['ocean_proximity'] == 'ISLAND']
+# Filtro por índice de categoría en lugar de comparar texto fila por fila
+indice = IndiceVivienda(df)
+vamosahacerunfiltro = indice.filtrar(ocean_proximity='ISLAND')
 print(vamosahacerunfiltro)
 
 ##vamos a hacer un grafico de dispersión
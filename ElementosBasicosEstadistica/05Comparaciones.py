@@ -1,9 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from simulacion import muestras_normales
+
 
 #vamos a craer una semilla random para reproductibilidad 
-np.random.seed(0)
+#(cada distribución sale de su propio flujo derivado de esta semilla)
+semilla = 0
 
 #vamos a buscar los parametros para una distribucion 
 #media
@@ -17,9 +20,7 @@ sigma3 = 3
 n_muestras = 1000
 
 #Vamos a generar los datos de las distibuciones normales
-data1 = np.random.normal(media, sigma1, n_muestras)
-data2 = np.random.normal(media, sigma2, n_muestras)
-data3 = np.random.normal(media, sigma3, n_muestras)
+data1, data2, data3 = muestras_normales(media, [sigma1, sigma2, sigma3], n_muestras, semilla)
 
 #vamos a configurar la grafica
 plt.figure(figsize=(10,6))
@@ -1,30 +1,28 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def cargar_datos(ruta_archivo):
-    return pd.read_csv(ruta_archivo)
+import histograma
+from cache_columnas import cargar_columnas
+from estadisticas import estados_de, tabla_descriptiva
+from graficas_densidad import dibujar_conteos
+
+def cargar_datos(ruta_archivo, columnas=None):
+    # Solo las columnas pedidas, mapeadas desde la caché por columnas
+    return cargar_columnas(ruta_archivo, columnas)
 
 def calcular_estadisticas(df, columnas):
-    stats = {
-        "Media": df[columnas].mean(),
-        "Mediana": df[columnas].median(),
-        "Moda": df[columnas].mode().iloc[0],  
-        "Rango": df[columnas].max() - df[columnas].min(),
-        "Varianza": df[columnas].var(),
-        "Desviación Estándar": df[columnas].std()
-    }
-    return pd.DataFrame(stats)
+    # Una sola lectura por columna con estado combinable (estadisticas.py)
+    return tabla_descriptiva(estados_de(df, columnas))
 
 def tabla_frecuencias(df, columna, bins=10):
-    df[columna + '_bins'] = pd.cut(df[columna], bins=bins)
-    freq_table = df[columna + '_bins'].value_counts().sort_index().reset_index()
-    freq_table.columns = ["Intervalo", "Frecuencia"]
-    return freq_table
+    # Conteo por intervalos sin agregar columnas a df (histograma.py)
+    return histograma.tabla_frecuencias(df[columna], bins)
 
 def generar_histograma(df, columnas, titulo="Histograma comparativo"):
     plt.figure(figsize=(10, 6))
     for columna in columnas:
-        plt.hist(df[columna], bins=30, alpha=0.5, label=columna)
+        conteos, bordes = histograma.histograma(df[columna], bins=30)
+        dibujar_conteos(conteos, bordes, alpha=0.5, label=columna)
     plt.xlabel("Valor")
     plt.ylabel("Frecuencia")
     plt.title(titulo)
@@ -34,8 +32,8 @@ def generar_histograma(df, columnas, titulo="Histograma comparativo"):
 
 ruta_csv = "housing.csv"
 
-df = cargar_datos(ruta_csv)
 columnas_analisis = ['median_house_value', 'total_bedrooms', 'population']
+df = cargar_datos(ruta_csv, columnas_analisis)
 
 estadisticas = calcular_estadisticas(df, columnas_analisis)
 print("\nEstadísticas Descriptivas:\n", estadisticas)
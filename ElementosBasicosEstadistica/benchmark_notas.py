@@ -0,0 +1,58 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from notas import aprobados, aprobados_lote, estadistica_notas, estadistica_notas_lote, tabla_larga
+
+
+def generar_cursos(n_grupos, alumnos_por_grupo, semilla=0):
+    """
+    {grupo: {alumno: nota}} con notas entre 0 y 10 redondeadas a una décima.
+    """
+    rng = np.random.default_rng(semilla)
+    notas = np.round(rng.uniform(0, 10, (n_grupos, alumnos_por_grupo)), 1)
+    alumnos = [f"Alumno {j}" for j in range(alumnos_por_grupo)]
+    return {f"Grupo {i}": dict(zip(alumnos, notas[i])) for i in range(n_grupos)}
+
+
+def comparar(n_grupos, alumnos_por_grupo, semilla=0):
+    """
+    Tiempo de llamar estadistica_notas/aprobados por grupo contra las versiones
+    por lote sobre la tabla larga, y verificación de que coinciden.
+    """
+    cursos = generar_cursos(n_grupos, alumnos_por_grupo, semilla)
+
+    inicio = time.perf_counter()
+    por_grupo = {g: (estadistica_notas(n), aprobados(n)) for g, n in cursos.items()}
+    segundos_bucle = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tabla = tabla_larga(cursos)
+    estadisticas = estadistica_notas_lote(tabla)
+    lista = aprobados_lote(tabla)
+    segundos_lote = time.perf_counter() - inicio
+
+    iguales = np.allclose(np.vstack([e.to_numpy() for e, _ in por_grupo.values()]),
+                          estadisticas.to_numpy(), equal_nan=True)
+    iguales &= all(np.array_equal(a.to_numpy(), lista.loc[g].to_numpy())
+                   for g, (_, a) in por_grupo.items() if len(a))
+    return {
+        'grupos': n_grupos,
+        'alumnos_por_grupo': alumnos_por_grupo,
+        'bucle_s': segundos_bucle,
+        'lote_s': segundos_lote,
+        'aceleracion': segundos_bucle / segundos_lote,
+        'iguales': bool(iguales),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Notas por grupo: bucle de diccionarios contra lote")
+    parser.add_argument('--grupos', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--alumnos', type=int, default=30)
+    args = parser.parse_args()
+
+    resultados = pd.DataFrame([comparar(n, args.alumnos) for n in args.grupos])
+    print(resultados.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Junto a este módulo, para que los scripts y el cuaderno de regresión compartan la caché
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_columnas')
+INDICE = 'indice.json'
+
+
+def huella_contenido(ruta):
+    """
+    sha1 del contenido: dos copias iguales del CSV usan la misma caché.
+    """
+    sha = hashlib.sha1()
+    with open(ruta, 'rb') as archivo:
+        for pedazo in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(pedazo)
+    return sha.hexdigest()
+
+
+def leer_indice(directorio):
+    try:
+        with open(os.path.join(directorio, INDICE), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_indice(directorio, indice):
+    temporal = os.path.join(directorio, INDICE + '.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(indice, archivo, ensure_ascii=False, indent=1)
+    os.replace(temporal, os.path.join(directorio, INDICE))
+
+
+def convertir(ruta, destino, **opciones):
+    """
+    Convierte el CSV a un archivo .npy por columna: las numéricas tal cual
+    (para abrirlas mapeadas en memoria) y las de texto como códigos + diccionario.
+    """
+    df = pd.read_csv(ruta, **opciones)
+    temporal = destino + '.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    columnas = []
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        archivo = f"c{i}.npy"
+        if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            np.save(os.path.join(temporal, archivo), serie.to_numpy())
+            columnas.append({'nombre': col, 'archivo': archivo, 'tipo': 'numerica'})
+        else:
+            categorica = serie.astype('category')
+            codigos = categorica.cat.codes.to_numpy()
+            np.save(os.path.join(temporal, archivo), codigos)
+            columnas.append({'nombre': col, 'archivo': archivo, 'tipo': 'diccionario',
+                             'categorias': categorica.cat.categories.astype(str).tolist()})
+
+    with open(os.path.join(temporal, 'meta.json'), 'w', encoding='utf-8') as archivo:
+        json.dump({'filas': len(df), 'columnas': columnas}, archivo, ensure_ascii=False)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporal, destino)
+
+
+def clave_opciones(opciones):
+    """
+    Huella corta de las opciones de pd.read_csv: el mismo CSV leído con otro
+    sep, dtype, decimal, etc. tiene su propia conversión en la caché.
+    """
+    texto = json.dumps(opciones, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:12]
+
+
+def limpiar_versiones(directorio, indice, huella):
+    """
+    Elimina las conversiones de un contenido que ya no usa ninguna ruta del índice
+    (por ejemplo, la versión anterior de un CSV que cambió).
+    """
+    if not huella or any(e['huella'] == huella for e in indice.values()):
+        return
+    for nombre in os.listdir(directorio):
+        if nombre == huella or nombre.startswith(huella + '-'):
+            shutil.rmtree(os.path.join(directorio, nombre), ignore_errors=True)
+
+
+def preparar_cache(ruta, directorio=DIRECTORIO_CACHE, **opciones):
+    """
+    Carpeta de la caché del CSV; la crea si el archivo es nuevo, si cambió o si
+    se lee con otras opciones. El índice relaciona (ruta, tamaño, fecha de
+    modificación) con la huella del contenido, así que solo se lee el archivo
+    completo cuando cambia.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    info = os.stat(ruta)
+    clave_ruta = os.path.abspath(ruta)
+    firma = [info.st_size, info.st_mtime_ns]
+
+    indice = leer_indice(directorio)
+    entrada = indice.get(clave_ruta)
+    if entrada and entrada['firma'] == firma:
+        huella = entrada['huella']
+    else:
+        huella = huella_contenido(ruta)
+        indice[clave_ruta] = {'firma': firma, 'huella': huella}
+        guardar_indice(directorio, indice)
+        if entrada and entrada['huella'] != huella:
+            limpiar_versiones(directorio, indice, entrada['huella'])
+
+    destino = os.path.join(directorio, f"{huella}-{clave_opciones(opciones)}")
+    if not os.path.exists(os.path.join(destino, 'meta.json')):
+        convertir(ruta, destino, **opciones)
+    return destino
+
+
+def cargar_columnas(ruta, columnas=None, directorio=DIRECTORIO_CACHE, **opciones):
+    """
+    DataFrame del CSV con solo las columnas pedidas (todas si columnas es None).
+    Las numéricas se abren mapeadas en memoria (solo lectura, sin copiar) y las
+    de texto se devuelven como categóricas a partir de su diccionario.
+    """
+    destino = preparar_cache(ruta, directorio, **opciones)
+    with open(os.path.join(destino, 'meta.json'), encoding='utf-8') as archivo:
+        meta = json.load(archivo)
+
+    disponibles = {c['nombre']: c for c in meta['columnas']}
+    if columnas is None:
+        columnas = list(disponibles)
+    faltantes = [c for c in columnas if c not in disponibles]
+    if faltantes:
+        raise KeyError(f"Columnas que no están en {os.path.basename(ruta)}: {faltantes}")
+
+    datos = {}
+    for col in columnas:
+        c = disponibles[col]
+        valores = np.load(os.path.join(destino, c['archivo']), mmap_mode='r')
+        if c['tipo'] == 'diccionario':
+            valores = pd.Categorical.from_codes(valores, categories=c['categorias'])
+        datos[col] = valores
+    return pd.DataFrame(datos, copy=False)
+
+
+def limpiar_cache(directorio=DIRECTORIO_CACHE):
+    shutil.rmtree(directorio, ignore_errors=True)
@@ -0,0 +1,154 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAS = ['ocean_proximity']
+NUMERICAS = ['median_income', 'median_house_value']
+
+
+class IndiceVivienda:
+    """
+    Índices sobre el DataFrame de housing para filtrar sin recorrer todas las filas:
+    - categóricas: categoría -> posiciones de sus filas (ordenadas)
+    - numéricas: valores ordenados + posiciones, para rangos con searchsorted
+    Las consultas devuelven posiciones ordenadas; filtrar devuelve las filas
+    en el mismo orden que df[mascara].
+    """
+
+    def __init__(self, df, categoricas=CATEGORICAS, numericas=NUMERICAS):
+        self.df = df
+        self.categorias = {col: self.indexar_categoria(df[col]) for col in categoricas}
+        self.ordenados = {col: self.indexar_numero(df[col]) for col in numericas}
+
+    @staticmethod
+    def indexar_categoria(serie):
+        codigos, categorias = pd.factorize(serie)
+        orden = np.argsort(codigos, kind='stable')
+        limites = np.cumsum(np.bincount(codigos[codigos >= 0], minlength=len(categorias)))
+        # Los nulos (código -1) quedan al principio del orden y no se indexan
+        inicio = int((codigos < 0).sum())
+        posiciones = np.split(orden[inicio:], limites[:-1])
+        return dict(zip(categorias, posiciones))
+
+    @staticmethod
+    def indexar_numero(serie):
+        valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        orden = np.argsort(valores, kind='stable')
+        ordenados = valores[orden]
+        # Los NaN quedan al final; los rangos solo miran los valores válidos
+        validos = int((~np.isnan(ordenados)).sum())
+        return ordenados[:validos], orden[:validos]
+
+    def igual(self, col, valor):
+        """
+        Posiciones con col == valor (o col en valor si es una lista).
+        """
+        if isinstance(valor, (list, tuple, set)):
+            # np.unique ordena y quita repetidos (valores repetidos en la lista)
+            partes = [self.igual(col, v) for v in valor]
+            return np.unique(np.concatenate(partes)) if partes else np.array([], dtype=np.int64)
+        if col in self.categorias:
+            return self.categorias[col].get(valor, np.array([], dtype=np.int64))
+        return self.rango(col, valor, valor)
+
+    def rango(self, col, minimo=None, maximo=None, incluir_minimo=True, incluir_maximo=True):
+        """
+        Posiciones con minimo <= col <= maximo (None = sin límite).
+        """
+        ordenados, orden = self.ordenados[col]
+        inicio = 0 if minimo is None else np.searchsorted(ordenados, minimo, 'left' if incluir_minimo else 'right')
+        fin = len(ordenados) if maximo is None else np.searchsorted(ordenados, maximo, 'right' if incluir_maximo else 'left')
+        return np.sort(orden[inicio:fin])
+
+    def posiciones(self, **condiciones):
+        """
+        Intersección de varias condiciones: un valor o una lista es igualdad
+        y una tupla (minimo, maximo) es un rango cerrado.
+        Se empieza por la condición con menos filas.
+        """
+        conjuntos = []
+        for col, condicion in condiciones.items():
+            if isinstance(condicion, tuple) and col in self.ordenados:
+                conjuntos.append(self.rango(col, *condicion))
+            else:
+                conjuntos.append(self.igual(col, condicion))
+        if not conjuntos:
+            return np.arange(len(self.df))
+        conjuntos.sort(key=len)
+        resultado = conjuntos[0]
+        for otro in conjuntos[1:]:
+            resultado = np.intersect1d(resultado, otro, assume_unique=True)
+        return resultado
+
+    def filtrar(self, **condiciones):
+        """
+        Filas que cumplen todas las condiciones (ver posiciones).
+        """
+        return self.df.iloc[self.posiciones(**condiciones)]
+
+
+def mascara(df, **condiciones):
+    """
+    La misma consulta con máscaras booleanas (recorriendo todas las filas).
+    """
+    resultado = np.ones(len(df), dtype=bool)
+    for col, condicion in condiciones.items():
+        if isinstance(condicion, tuple) and pd.api.types.is_numeric_dtype(df[col]):
+            minimo, maximo = condicion
+            resultado &= df[col].notna().to_numpy()
+            if minimo is not None:
+                resultado &= (df[col] >= minimo).to_numpy()
+            if maximo is not None:
+                resultado &= (df[col] <= maximo).to_numpy()
+        elif isinstance(condicion, (list, tuple, set)):
+            resultado &= df[col].isin(list(condicion)).to_numpy()
+        else:
+            resultado &= (df[col] == condicion).to_numpy()
+    return resultado
+
+
+def medir_aceleracion(indice, consultas, repeticiones=20):
+    """
+    Compara cada consulta (diccionario de condiciones) por índice contra la
+    máscara booleana, verifica que den las mismas filas y devuelve una tabla.
+    """
+    filas = []
+    for condiciones in consultas:
+        esperado = np.flatnonzero(mascara(indice.df, **condiciones))
+        obtenido = indice.posiciones(**condiciones)
+        if not np.array_equal(esperado, obtenido):
+            raise AssertionError(f"La consulta {condiciones} no coincide con la máscara")
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            indice.df[mascara(indice.df, **condiciones)]
+        segundos_mascara = (time.perf_counter() - inicio) / repeticiones
+
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            indice.filtrar(**condiciones)
+        segundos_indice = (time.perf_counter() - inicio) / repeticiones
+
+        filas.append({'consulta': condiciones, 'filas': len(obtenido),
+                      'mascara_ms': segundos_mascara * 1000, 'indice_ms': segundos_indice * 1000,
+                      'aceleracion': segundos_mascara / segundos_indice})
+    return pd.DataFrame(filas)
+
+
+if __name__ == "__main__":
+    from cache_columnas import cargar_columnas
+
+    df = cargar_columnas('housing.csv')
+    inicio = time.perf_counter()
+    indice = IndiceVivienda(df)
+    print(f"Índices construidos en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    consultas = [
+        {'ocean_proximity': 'ISLAND'},
+        {'ocean_proximity': ['NEAR BAY', 'NEAR OCEAN']},
+        {'median_income': (8.0, None)},
+        {'median_house_value': (100000, 150000)},
+        {'ocean_proximity': 'INLAND', 'median_income': (5.0, 7.5), 'median_house_value': (None, 200000)},
+    ]
+    print(medir_aceleracion(indice, consultas).to_string(float_format=lambda v: f"{v:,.3f}"))
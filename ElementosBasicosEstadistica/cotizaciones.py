@@ -0,0 +1,117 @@
+import glob
+import os
+
+import pandas as pd
+
+FILAS_MUESTRA = 1000
+NUMERO = r'[-+]?[\d.,]+'
+
+
+def detectar_formato(valores):
+    """
+    Separador decimal y de miles de una columna a partir de una muestra de textos.
+    Devuelve (decimal, miles) o None si la columna no es numérica.
+    Los casos ambiguos se resuelven con la convención europea (decimal ',' y miles '.').
+    """
+    valores = valores.dropna().astype(str).str.strip()
+    valores = valores[valores != '']
+    if valores.empty or not valores.str.fullmatch(NUMERO).all():
+        return None
+
+    coma = valores.str.contains(',', regex=False)
+    punto = valores.str.contains('.', regex=False)
+    ambos = coma & punto
+    if ambos.any():
+        # El último separador de un número con ambos es el decimal
+        ultimo_coma = (valores[ambos].str.rfind(',') > valores[ambos].str.rfind('.')).mean() >= 0.5
+        return (',', '.') if ultimo_coma else ('.', ',')
+    if (valores.str.count(r'\.') > 1).any():
+        return ',', '.'
+    if (valores.str.count(',') > 1).any():
+        return '.', ','
+    if coma.any():
+        return ',', '.'
+    if punto.any():
+        # Solo puntos: miles si todos separan grupos de tres dígitos
+        return (',', '.') if valores[punto].str.fullmatch(r'[-+]?\d{1,3}(\.\d{3})+').all() else ('.', None)
+    return '.', None
+
+
+def miles_irregulares(valores, miles):
+    """
+    Cuántos valores de la muestra usan el separador de miles sin grupos de tres dígitos
+    (por ejemplo '842.54' cuando los miles van con punto).
+    """
+    if miles is None:
+        return 0
+    valores = valores.dropna().astype(str)
+    con_miles = valores[valores.str.contains(miles, regex=False)]
+    grupo = r'[-+]?\d{1,3}(' + '\\' + miles + r'\d{3})+([^\d' + '\\' + miles + r'].*)?'
+    return int((~con_miles.str.fullmatch(grupo)).sum())
+
+
+def detectar_formatos(muestra, ruta=''):
+    """
+    {columna: (decimal, miles) o None} de una muestra leída como texto.
+    Avisa de las columnas con separadores de miles irregulares.
+    """
+    formatos = {}
+    for col in muestra.columns:
+        formatos[col] = detectar_formato(muestra[col])
+        if formatos[col]:
+            irregulares = miles_irregulares(muestra[col], formatos[col][1])
+            if irregulares:
+                print(f"Aviso: {os.path.basename(ruta)}, columna {col}: "
+                      f"{irregulares} valores con separador de miles irregular")
+    return formatos
+
+
+def posiciones_indice(index_col, columnas):
+    """
+    Posiciones en el archivo de las columnas del índice (index_col como en pd.read_csv:
+    None, una posición, un nombre o una lista).
+    """
+    if index_col is None or index_col is False:
+        return []
+    return [c if isinstance(c, int) else columnas.index(c)
+            for c in (index_col if isinstance(index_col, (list, tuple)) else [index_col])]
+
+
+def leer_cotizacion(ruta, sep=';', index_col=0, filas_muestra=FILAS_MUESTRA, encoding=None):
+    """
+    Lee un CSV de cotizaciones con números en formato europeo ('95,95', '84.962').
+    El formato se detecta por columna y las columnas con el mismo formato se
+    convierten juntas con el lector en C de pandas (decimal/thousands), sin
+    conversiones celda a celda.
+    """
+    muestra = pd.read_csv(ruta, sep=sep, dtype=str, nrows=filas_muestra, encoding=encoding)
+    # Por posición, para que sirva con índices sin nombre en el encabezado
+    indice = posiciones_indice(index_col, list(muestra.columns))
+    valores = [i for i in range(muestra.shape[1]) if i not in indice]
+    formatos = detectar_formatos(muestra.iloc[:, valores], ruta)
+    grupos = {}
+    for posicion, formato in zip(valores, formatos.values()):
+        grupos.setdefault(formato, []).append(posicion)
+
+    partes = []
+    for formato, posiciones in grupos.items():
+        opciones = {'dtype': str} if formato is None else {'decimal': formato[0], 'thousands': formato[1]}
+        usecols = sorted(indice + posiciones)
+        # index_col se cuenta dentro de las columnas leídas
+        partes.append(pd.read_csv(ruta, sep=sep, usecols=usecols,
+                                  index_col=[usecols.index(i) for i in indice] or None,
+                                  encoding=encoding, **opciones))
+    return pd.concat(partes, axis=1)[list(formatos)]
+
+
+def leer_directorio(directorio, patron='*.csv', **opciones):
+    """
+    Lee todos los archivos diarios de un directorio con leer_cotizacion (cada uno
+    con su propio formato detectado) y los junta con el nombre del archivo como
+    primer nivel del índice.
+    """
+    rutas = sorted(glob.glob(os.path.join(directorio, patron)))
+    if not rutas:
+        raise FileNotFoundError(f"No hay archivos {patron} en {directorio}")
+    partes = {os.path.splitext(os.path.basename(r))[0]: leer_cotizacion(r, **opciones) for r in rutas}
+    return pd.concat(partes, names=['archivo'])
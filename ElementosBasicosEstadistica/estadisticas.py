@@ -0,0 +1,279 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Con más valores distintos que esto, mediana y moda pasan a un resumen aproximado
+MAX_DISTINTOS = 1_000_000
+# Cifras significativas del resumen aproximado (error relativo < 10^-CIFRAS)
+CIFRAS_APROXIMADAS = 4
+# Archivos más chicos que esto se leen en un solo proceso
+MIN_BYTES_PARALELO = 8 * 1024 * 1024
+# Filas por bloque al leer un CSV: la memoria no depende del tamaño del archivo
+TAM_BLOQUE = 500_000
+
+
+@dataclass
+class EstadoColumna:
+    """
+    Estado combinable de una columna: conteo, mínimo, máximo, media y M2
+    (suma de desviaciones al cuadrado, Welford/Chan), más la frecuencia de cada
+    valor para la mediana y la moda (None si no se piden).
+    """
+    n: int = 0
+    minimo: float = np.nan
+    maximo: float = np.nan
+    media: float = np.nan
+    m2: float = 0.0
+    conteos: pd.Series = None
+    exacto: bool = True
+
+
+def redondear_significativas(valores, cifras=CIFRAS_APROXIMADAS):
+    """
+    Redondea a 'cifras' cifras significativas; es determinista, así que los
+    resúmenes redondeados de distintos bloques se pueden sumar.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    magnitud = np.floor(np.log10(np.abs(np.where(valores == 0, 1, valores))))
+    escala = 10.0 ** (cifras - 1 - magnitud)
+    return np.round(valores * escala) / escala
+
+
+def limitar_conteos(conteos, max_distintos=MAX_DISTINTOS):
+    """
+    Si hay demasiados valores distintos, agrupa los conteos por valor redondeado.
+    Devuelve (conteos, exacto).
+    """
+    if len(conteos) <= max_distintos:
+        return conteos, True
+    redondeados = redondear_significativas(conteos.index.to_numpy())
+    return conteos.groupby(redondeados).sum(), False
+
+
+def estado_columna(valores, con_conteos=True, max_distintos=MAX_DISTINTOS):
+    """
+    Estado de una columna en una sola lectura de sus valores (los nulos no cuentan).
+    """
+    v = np.asarray(valores, dtype=np.float64)
+    v = v[~np.isnan(v)]
+    if len(v) == 0:
+        return EstadoColumna(conteos=pd.Series(dtype=np.int64) if con_conteos else None)
+
+    media = v.mean()
+    estado = EstadoColumna(n=len(v), minimo=v.min(), maximo=v.max(), media=media,
+                           m2=float(((v - media) ** 2).sum()))
+    if con_conteos:
+        unicos, frecuencias = np.unique(v, return_counts=True)
+        estado.conteos, estado.exacto = limitar_conteos(pd.Series(frecuencias, index=unicos), max_distintos)
+    return estado
+
+
+def combinar(a, b, max_distintos=MAX_DISTINTOS):
+    """
+    Estado de la unión de dos conjuntos de datos (fórmula de Chan para media y M2).
+    """
+    if a.n == 0:
+        return b
+    if b.n == 0:
+        return a
+    n = a.n + b.n
+    delta = b.media - a.media
+    estado = EstadoColumna(
+        n=n,
+        minimo=min(a.minimo, b.minimo),
+        maximo=max(a.maximo, b.maximo),
+        media=a.media + delta * b.n / n,
+        m2=a.m2 + b.m2 + delta ** 2 * a.n * b.n / n,
+        exacto=a.exacto and b.exacto,
+    )
+    if a.conteos is not None and b.conteos is not None:
+        conteos = a.conteos.add(b.conteos, fill_value=0).astype(np.int64).sort_index()
+        if not estado.exacto:
+            conteos = conteos.groupby(redondear_significativas(conteos.index.to_numpy())).sum()
+        estado.conteos, exacto = limitar_conteos(conteos, max_distintos)
+        estado.exacto = estado.exacto and exacto
+    return estado
+
+
+def varianza(estado):
+    return estado.m2 / (estado.n - 1) if estado.n > 1 else np.nan
+
+
+def mediana(estado):
+    """
+    Mediana a partir de las frecuencias (promedio de los dos centrales si n es par).
+    """
+    if not estado.n:
+        return np.nan
+    acumulado = estado.conteos.to_numpy().cumsum()
+    valores = estado.conteos.index.to_numpy()
+    bajo = valores[np.searchsorted(acumulado, (estado.n - 1) // 2, side='right')]
+    alto = valores[np.searchsorted(acumulado, estado.n // 2, side='right')]
+    return (bajo + alto) / 2
+
+
+def moda(estado):
+    """
+    Valor más frecuente; con empate, el menor (como df.mode().iloc[0]).
+    """
+    if not estado.n:
+        return np.nan
+    return estado.conteos.index[estado.conteos.to_numpy().argmax()]
+
+
+def valores_numericos(serie):
+    """
+    Valores float64 de una Serie; lo que no es número queda como nulo
+    (como pd.to_numeric(..., errors='coerce')).
+    """
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = pd.to_numeric(serie.astype(object), errors='coerce')
+    return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def estados_de(df, columnas=None, con_conteos=True):
+    """
+    {columna: EstadoColumna} de un DataFrame (o una Serie).
+    """
+    if isinstance(df, pd.Series):
+        return {df.name: estado_columna(valores_numericos(df), con_conteos)}
+    columnas = list(df.columns) if columnas is None else columnas
+    return {col: estado_columna(valores_numericos(df[col]), con_conteos) for col in columnas}
+
+
+def combinar_estados(partes):
+    """
+    Combina una lista de {columna: EstadoColumna} (por ejemplo, uno por bloque).
+    """
+    total = {}
+    for parte in partes:
+        for col, estado in parte.items():
+            total[col] = combinar(total[col], estado) if col in total else estado
+    return total
+
+
+def tabla_descriptiva(estados):
+    """
+    Media, mediana, moda, rango, varianza y desviación estándar por columna
+    (mismo formato que calcular_estadisticas).
+    """
+    filas = {}
+    for col, e in estados.items():
+        var = varianza(e)
+        filas[col] = {
+            "Media": e.media,
+            "Mediana": mediana(e),
+            "Moda": moda(e),
+            "Rango": e.maximo - e.minimo,
+            "Varianza": var,
+            "Desviación Estándar": np.sqrt(var),
+        }
+    return pd.DataFrame.from_dict(filas, orient='index')
+
+
+def tabla_resumen(estados):
+    """
+    Mínimo, máximo, media y desviación estándar: filas = estadísticos, columnas = columnas.
+    """
+    return pd.DataFrame({col: [e.minimo, e.maximo, e.media, np.sqrt(varianza(e))]
+                         for col, e in estados.items()},
+                        index=['Min', 'Max', 'Media', 'Desviación Estándar'])
+
+
+def rangos_de_bytes(ruta, partes):
+    """
+    Divide un CSV en 'partes' rangos de bytes que empiezan y terminan en un salto de línea.
+    Devuelve la línea de encabezado y la lista de rangos (inicio, fin).
+    No sirve para CSV con saltos de línea dentro de campos entre comillas.
+    """
+    tam = os.path.getsize(ruta)
+    with open(ruta, 'rb') as archivo:
+        encabezado = archivo.readline()
+        cortes = [archivo.tell()]
+        for i in range(1, partes):
+            archivo.seek(max(tam * i // partes, cortes[-1]))
+            archivo.readline()
+            cortes.append(min(archivo.tell(), tam))
+    cortes.append(tam)
+    return encabezado, [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+
+class LectorRango(io.RawIOBase):
+    """
+    Archivo de solo lectura que entrega el encabezado y luego solo los bytes
+    inicio:fin del CSV, sin cargarlos de una vez (para pd.read_csv con chunksize).
+    """
+
+    def __init__(self, ruta, encabezado, inicio, fin):
+        super().__init__()
+        self.archivo = open(ruta, 'rb')
+        self.archivo.seek(inicio)
+        self.pendiente = encabezado
+        self.restante = fin - inicio
+
+    def readable(self):
+        return True
+
+    def readinto(self, destino):
+        if self.pendiente:
+            n = min(len(destino), len(self.pendiente))
+            destino[:n] = self.pendiente[:n]
+            self.pendiente = self.pendiente[n:]
+            return n
+        n = min(len(destino), self.restante)
+        if n <= 0:
+            return 0
+        leidos = self.archivo.readinto(memoryview(destino)[:n])
+        self.restante -= leidos
+        return leidos
+
+    def close(self):
+        self.archivo.close()
+        super().close()
+
+
+def abrir_rango(ruta, encabezado, inicio, fin):
+    return io.BufferedReader(LectorRango(ruta, encabezado, inicio, fin))
+
+
+def estados_bloques(lector, columnas, con_conteos, tam_bloque, opciones):
+    """
+    Estados de un CSV (ruta o archivo abierto) leído por bloques de tam_bloque filas.
+    """
+    bloques = pd.read_csv(lector, usecols=columnas, chunksize=tam_bloque, **opciones)
+    with bloques:
+        estados = combinar_estados(estados_de(bloque, columnas, con_conteos) for bloque in bloques)
+    # Un archivo sin filas no produce bloques
+    for col in columnas or []:
+        estados.setdefault(col, estado_columna([], con_conteos))
+    return estados
+
+
+def estados_rango(ruta, encabezado, inicio, fin, columnas, con_conteos, opciones, tam_bloque=TAM_BLOQUE):
+    """
+    Estados de los bytes inicio:fin del CSV, por bloques.
+    """
+    with abrir_rango(ruta, encabezado, inicio, fin) as lector:
+        return estados_bloques(lector, columnas, con_conteos, tam_bloque, opciones)
+
+
+def estadisticas_csv(ruta, columnas, trabajadores=None, con_conteos=True, tam_bloque=TAM_BLOQUE, **opciones):
+    """
+    Estados de las columnas de un CSV leyéndolo por rangos de bytes en varios procesos
+    y combinando los resultados. Con un trabajador o un archivo chico se lee en serie.
+    Cada parte se lee por bloques de tam_bloque filas; opciones se pasan a pd.read_csv.
+    """
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores <= 1 or os.path.getsize(ruta) < MIN_BYTES_PARALELO:
+        return estados_bloques(ruta, columnas, con_conteos, tam_bloque, opciones)
+
+    encabezado, rangos = rangos_de_bytes(ruta, trabajadores)
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        partes = pool.map(estados_rango, *zip(*[(ruta, encabezado, a, b, columnas, con_conteos, opciones, tam_bloque)
+                                                for a, b in rangos]))
+        return combinar_estados(list(partes))
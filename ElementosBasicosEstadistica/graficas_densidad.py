@@ -0,0 +1,74 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+
+from histograma import indices_intervalo
+
+RESOLUCION = 200
+
+
+def limites(valores):
+    """
+    (mínimo, máximo) de los valores finitos; si son iguales se abre medio punto.
+    """
+    valores = valores[np.isfinite(valores)]
+    minimo, maximo = float(valores.min()), float(valores.max())
+    return (minimo - 0.5, maximo + 0.5) if minimo == maximo else (minimo, maximo)
+
+
+def rejilla_densidad(x, y, bins=RESOLUCION, rango=None):
+    """
+    Conteo de puntos en una rejilla de bins x bins (o (nx, ny)) con bincount,
+    con los mismos intervalos que np.histogram2d (histograma.indices_intervalo).
+    Devuelve (conteos[nx, ny], bordes_x, bordes_y); el costo de dibujarla
+    depende de la resolución y no del número de puntos.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    nx, ny = (bins, bins) if np.isscalar(bins) else bins
+    (x0, x1), (y0, y1) = rango if rango is not None else (limites(x), limites(y))
+    bordes_x, bordes_y = np.linspace(x0, x1, nx + 1), np.linspace(y0, y1, ny + 1)
+
+    ix = indices_intervalo(x, bordes_x, cerrado_derecha=False)
+    iy = indices_intervalo(y, bordes_y, cerrado_derecha=False)
+    dentro = (ix >= 0) & (iy >= 0)
+    conteos = np.bincount(ix[dentro] * ny + iy[dentro], minlength=nx * ny).reshape(nx, ny)
+    return conteos, bordes_x, bordes_y
+
+
+def rejilla_por_bloques(bloques, rango, bins=RESOLUCION):
+    """
+    Suma las rejillas de bloques (x, y); el rango se fija de antemano
+    para que todos los bloques usen los mismos bordes. Sin bloques la rejilla queda en ceros.
+    """
+    vacio = np.array([], dtype=np.float64)
+    total, bordes_x, bordes_y = rejilla_densidad(vacio, vacio, bins, rango)
+    for x, y in bloques:
+        total += rejilla_densidad(x, y, bins, rango)[0]
+    return total, bordes_x, bordes_y
+
+
+def dibujar_densidad(x, y, ax=None, bins=RESOLUCION, rango=None, cmap='Blues', escala_log=True,
+                     etiqueta='Puntos por celda'):
+    """
+    Dibuja la densidad de puntos como imagen en lugar de un marcador por punto.
+    Las celdas vacías quedan en blanco.
+    """
+    ax = ax or plt.gca()
+    conteos, bordes_x, bordes_y = rejilla_densidad(x, y, bins, rango)
+    imagen = np.ma.masked_equal(conteos.T, 0)
+    norma = LogNorm(vmin=1, vmax=max(conteos.max(), 1)) if escala_log else None
+    malla = ax.imshow(imagen, origin='lower', aspect='auto', cmap=cmap, norm=norma,
+                      extent=(bordes_x[0], bordes_x[-1], bordes_y[0], bordes_y[-1]),
+                      interpolation='nearest')
+    plt.colorbar(malla, ax=ax, label=etiqueta)
+    return malla
+
+
+def dibujar_conteos(conteos, bordes, ax=None, **kwargs):
+    """
+    Dibuja un histograma ya contado (por ejemplo de histograma.histograma)
+    sin pasar los valores originales a matplotlib.
+    """
+    ax = ax or plt.gca()
+    return ax.hist(bordes[:-1], bins=bordes, weights=conteos, **kwargs)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+TAM_BLOQUE = 100_000
+
+
+def bloques_csv(ruta, columna, tam_bloque=TAM_BLOQUE, **opciones):
+    """
+    Función que, cada vez que se llama, recorre de nuevo una columna de un CSV por bloques.
+    Así se pueden hacer dos pasadas (mínimo/máximo y conteo) sin cargar el archivo.
+    """
+    def bloques():
+        for bloque in pd.read_csv(ruta, usecols=[columna], chunksize=tam_bloque, **opciones):
+            yield bloque[columna].to_numpy(dtype=np.float64, na_value=np.nan)
+    return bloques
+
+
+def recorrer(valores):
+    """
+    Bloques de valores float64: una función como la de bloques_csv,
+    o una Serie/arreglo que se toma como un solo bloque.
+    """
+    if callable(valores):
+        return valores()
+    return [np.asarray(valores, dtype=np.float64)]
+
+
+def minimo_maximo(valores):
+    """
+    Pasada rápida de mínimo y máximo (sin nulos) por bloques.
+    """
+    minimo, maximo = np.inf, -np.inf
+    for bloque in recorrer(valores):
+        bloque = bloque[~np.isnan(bloque)]
+        if len(bloque):
+            minimo, maximo = min(minimo, bloque.min()), max(maximo, bloque.max())
+    if minimo > maximo:
+        raise ValueError("No hay valores para calcular el histograma")
+    return minimo, maximo
+
+
+def indices_intervalo(valores, bordes, cerrado_derecha=True):
+    """
+    Intervalo de cada valor con searchsorted; fuera de los bordes (o nulo) da -1.
+    cerrado_derecha=True usa intervalos (a, b] como pd.cut; False usa [a, b)
+    con el último cerrado como np.histogram / plt.hist.
+    """
+    n_bins = len(bordes) - 1
+    if cerrado_derecha:
+        indices = np.searchsorted(bordes, valores, side='left') - 1
+    else:
+        indices = np.searchsorted(bordes, valores, side='right') - 1
+        indices[valores == bordes[-1]] = n_bins - 1
+    indices[(indices < 0) | (indices >= n_bins) | np.isnan(valores)] = -1
+    return indices
+
+
+def contar(valores, bordes, cerrado_derecha=True):
+    """
+    Conteo por intervalo con searchsorted + bincount, bloque a bloque
+    (cerrado_derecha como en indices_intervalo).
+    """
+    n_bins = len(bordes) - 1
+    conteos = np.zeros(n_bins, dtype=np.int64)
+    for bloque in recorrer(valores):
+        indices = indices_intervalo(bloque, bordes, cerrado_derecha)
+        conteos += np.bincount(indices[indices >= 0], minlength=n_bins)
+    return conteos
+
+
+def tabla_frecuencias(valores, bins=10):
+    """
+    Tabla Intervalo/Frecuencia igual a pd.cut(valores, bins).value_counts().sort_index(),
+    sin crear una columna de intervalos. Los bordes (y sus etiquetas) salen de
+    pd.cut aplicado solo al mínimo y al máximo.
+    """
+    minimo, maximo = minimo_maximo(valores)
+    extremos, bordes = pd.cut(pd.Series([minimo, maximo]), bins=bins, retbins=True)
+    intervalos = extremos.cat.categories
+    return pd.DataFrame({
+        "Intervalo": pd.Categorical(intervalos, categories=intervalos, ordered=True),
+        "Frecuencia": contar(valores, bordes),
+    })
+
+
+def histograma(valores, bins=30):
+    """
+    Conteos y bordes con las mismas reglas que np.histogram / plt.hist,
+    para dibujarlos con plt.hist(bordes[:-1], bordes, weights=conteos).
+    """
+    minimo, maximo = minimo_maximo(valores)
+    if minimo == maximo:
+        minimo, maximo = minimo - 0.5, maximo + 0.5
+    bordes = np.linspace(minimo, maximo, bins + 1)
+    return contar(valores, bordes, cerrado_derecha=False), bordes
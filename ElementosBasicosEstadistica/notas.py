@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from estadisticas import estados_de, tabla_resumen
+
+NOTA_APROBATORIA = 6
+ESTADISTICOS = ['Min', 'Max', 'Media', 'Desviación Estándar']
+
+
+def estadistica_notas(notas):
+    """
+    Mínimo, máximo, media y desviación típica de un diccionario {alumno: nota}.
+    """
+    notas = pd.Series(notas, name='notas')
+    estadisticas = tabla_resumen(estados_de(notas, con_conteos=False))['notas']
+    return estadisticas.rename(None)
+
+
+def aprobados(notas):
+    notas = pd.Series(notas)
+    return notas [notas >= NOTA_APROBATORIA].sort_values(ascending=False)
+
+
+def tabla_larga(cursos, grupo='grupo', alumno='alumno', nota='nota'):
+    """
+    Convierte {grupo: {alumno: nota}} en una tabla larga (grupo, alumno, nota).
+    """
+    grupos, alumnos, valores = [], [], []
+    for nombre, notas in cursos.items():
+        grupos += [nombre] * len(notas)
+        alumnos += list(notas.keys())
+        valores += list(notas.values())
+    return pd.DataFrame({grupo: grupos, alumno: alumnos, nota: np.asarray(valores, dtype=np.float64)})
+
+
+def estadistica_notas_lote(tabla, grupo='grupo', nota='nota'):
+    """
+    estadistica_notas para todos los grupos de una tabla larga en un solo groupby.
+    Devuelve un DataFrame con un renglón por grupo (en el orden de aparición).
+    """
+    resultado = tabla.groupby(grupo, sort=False)[nota].agg(['min', 'max', 'mean', 'std'])
+    resultado.columns = ESTADISTICOS
+    return resultado
+
+
+def aprobados_lote(tabla, grupo='grupo', alumno='alumno', nota='nota', minimo=NOTA_APROBATORIA):
+    """
+    aprobados para todos los grupos: Serie con índice (grupo, alumno), ordenada
+    de mayor a menor nota dentro de cada grupo (los grupos en orden de aparición).
+    """
+    codigos = pd.factorize(tabla[grupo])[0]
+    valores = tabla[nota].to_numpy(dtype=np.float64)
+    posiciones = np.flatnonzero(valores >= minimo)
+    # Orden por grupo y luego por nota descendente (estable: empates en orden de entrada)
+    posiciones = posiciones[np.lexsort((-valores[posiciones], codigos[posiciones]))]
+    aprobadas = tabla.iloc[posiciones]
+    return pd.Series(valores[posiciones],
+                     index=pd.MultiIndex.from_arrays([aprobadas[grupo], aprobadas[alumno]]),
+                     name=nota)
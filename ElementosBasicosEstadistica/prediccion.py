@@ -0,0 +1,222 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+
+from regresion_online import ajuste, estado_de
+
+X = 'median_income'
+Y = 'median_house_value'
+
+
+class ModeloVivienda:
+    """
+    Recta ajustada (pendiente, intersección) más los datos observados ordenados
+    por x, para buscar valores reales con searchsorted en lugar de comparar
+    toda la columna.
+    """
+
+    def __init__(self, pendiente, interseccion, x_ordenados, y_ordenados):
+        self.pendiente = float(pendiente)
+        self.interseccion = float(interseccion)
+        self.x_ordenados = np.asarray(x_ordenados, dtype=np.float64)
+        self.y_ordenados = np.asarray(y_ordenados, dtype=np.float64)
+        # Se revisa al ajustar y al cargar, antes de que lo use un servidor
+        if len(self.x_ordenados) == 0:
+            raise ValueError("El modelo necesita al menos una observación con x e y válidos")
+        if len(self.x_ordenados) != len(self.y_ordenados):
+            raise ValueError("x_ordenados e y_ordenados deben tener el mismo tamaño")
+
+    @classmethod
+    def ajustar(cls, df, x=X, y=Y):
+        """
+        Ajusta la recta con regresion_online e indexa las filas con x e y válidos.
+        """
+        pendiente, interseccion, *_ = ajuste(estado_de(df, x, y))
+        xs = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+        ys = df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+        validos = ~(np.isnan(xs) | np.isnan(ys))
+        xs, ys = xs[validos], ys[validos]
+        # Estable: entre valores iguales de x se conserva el orden del DataFrame
+        orden = np.argsort(xs, kind='stable')
+        return cls(pendiente, interseccion, xs[orden], ys[orden])
+
+    def predecir(self, x):
+        """
+        Precio estimado para un valor o un arreglo de valores de x.
+        """
+        return self.pendiente * np.asarray(x, dtype=np.float64) + self.interseccion
+
+    def valores_reales(self, x):
+        """
+        Valores observados de y cuyo x es exactamente x
+        (lo mismo que df.loc[df[X] == x, Y], en el mismo orden).
+        """
+        inicio = np.searchsorted(self.x_ordenados, x, side='left')
+        fin = np.searchsorted(self.x_ordenados, x, side='right')
+        return self.y_ordenados[inicio:fin]
+
+    def mas_cercanos(self, x):
+        """
+        Para cada valor de x, el x observado más cercano y su y
+        (con empate de distancia gana el menor; entre filas con el mismo x, la primera).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        derecha = np.clip(np.searchsorted(self.x_ordenados, x, side='left'), 1, len(self.x_ordenados) - 1)
+        izquierda = derecha - 1
+        usar_izquierda = np.abs(x - self.x_ordenados[izquierda]) <= np.abs(self.x_ordenados[derecha] - x)
+        posiciones = np.where(usar_izquierda, izquierda, derecha)
+        # Primera fila con ese mismo x
+        posiciones = np.searchsorted(self.x_ordenados, self.x_ordenados[posiciones], side='left')
+        return self.x_ordenados[posiciones], self.y_ordenados[posiciones]
+
+    def responder(self, x):
+        """
+        Respuesta de un lote: predicción y valor real más cercano para cada x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        x_cercano, y_cercano = self.mas_cercanos(x)
+        return {'prediccion': self.predecir(x).tolist(),
+                'x_cercano': x_cercano.tolist(),
+                'valor_cercano': y_cercano.tolist()}
+
+    def guardar(self, ruta):
+        np.savez(ruta, coeficientes=[self.pendiente, self.interseccion],
+                 x_ordenados=self.x_ordenados, y_ordenados=self.y_ordenados)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta) as datos:
+            pendiente, interseccion = datos['coeficientes']
+            return cls(pendiente, interseccion, datos['x_ordenados'], datos['y_ordenados'])
+
+
+def servir_lineas(modelo, entrada=sys.stdin, salida=sys.stdout):
+    """
+    Modo stdin/stdout: cada línea trae varios valores de x (separados por espacios
+    o comas) y se contesta con una línea JSON con todas sus predicciones.
+    """
+    for linea in entrada:
+        linea = linea.replace(',', ' ').strip()
+        if not linea:
+            continue
+        try:
+            respuesta = modelo.responder(np.array(linea.split(), dtype=np.float64))
+        except ValueError as error:
+            respuesta = {'error': str(error)}
+        salida.write(json.dumps(respuesta) + '\n')
+        salida.flush()
+
+
+def crear_servidor(modelo, puerto=8000, host='127.0.0.1'):
+    """
+    Servidor HTTP local: POST con {"x": [..]} devuelve las predicciones del lote.
+    """
+    class Manejador(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                cuerpo = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                datos = json.dumps(modelo.responder(cuerpo['x'])).encode()
+                codigo = 200
+            except (ValueError, KeyError, TypeError) as error:
+                datos = json.dumps({'error': str(error)}).encode()
+                codigo = 400
+            self.send_response(codigo)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, puerto), Manejador)
+
+
+def pedir(url, x):
+    """
+    Cliente: manda un lote de valores al servidor y devuelve su respuesta.
+    """
+    datos = json.dumps({'x': list(map(float, x))}).encode()
+    with urlopen(Request(url, data=datos, headers={'Content-Type': 'application/json'})) as respuesta:
+        return json.loads(respuesta.read())
+
+
+def medir_rendimiento(modelo, df, tamanos_lote=(1, 100, 10_000), repeticiones=20, semilla=0):
+    """
+    Predicciones por segundo: bucle escalar con la búsqueda por igualdad del
+    cuaderno contra predecir/mas_cercanos por lote y contra el servidor HTTP.
+    """
+    rng = np.random.default_rng(semilla)
+    consultas = rng.choice(modelo.x_ordenados, max(tamanos_lote))
+    filas = []
+
+    n = min(200, len(consultas))
+    inicio = time.perf_counter()
+    for ingreso in consultas[:n]:
+        modelo.pendiente * ingreso + modelo.interseccion
+        df.loc[df[X] == ingreso, Y]
+    filas.append({'modo': 'escalar + df.loc', 'lote': 1, 'pred_por_s': n / (time.perf_counter() - inicio)})
+
+    for tam in tamanos_lote:
+        lote = consultas[:tam]
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            modelo.predecir(lote)
+            modelo.mas_cercanos(lote)
+        filas.append({'modo': 'lote numpy', 'lote': tam,
+                      'pred_por_s': tam * repeticiones / (time.perf_counter() - inicio)})
+
+    servidor = crear_servidor(modelo, puerto=0)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+    try:
+        for tam in tamanos_lote:
+            lote = consultas[:tam]
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                pedir(url, lote)
+            filas.append({'modo': 'http', 'lote': tam,
+                          'pred_por_s': tam * repeticiones / (time.perf_counter() - inicio)})
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    return pd.DataFrame(filas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predicción del valor de vivienda por lotes")
+    parser.add_argument('modo', choices=['lineas', 'http', 'benchmark'])
+    parser.add_argument('--modelo', help="Archivo .npz guardado con ModeloVivienda.guardar")
+    parser.add_argument('--datos', default='housing.csv')
+    parser.add_argument('--puerto', type=int, default=8000)
+    args = parser.parse_args()
+
+    from cache_columnas import cargar_columnas
+
+    df = None
+    if args.modelo:
+        modelo = ModeloVivienda.cargar(args.modelo)
+    else:
+        df = cargar_columnas(args.datos, [X, Y])
+        modelo = ModeloVivienda.ajustar(df)
+
+    if args.modo == 'lineas':
+        servir_lineas(modelo)
+    elif args.modo == 'http':
+        servidor = crear_servidor(modelo, args.puerto)
+        print(f"Escuchando en http://127.0.0.1:{servidor.server_address[1]}/", file=sys.stderr)
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    else:
+        df = cargar_columnas(args.datos, [X, Y]) if df is None else df
+        print(medir_rendimiento(modelo, df).to_string(index=False, float_format=lambda v: f"{v:,.0f}"))
@@ -0,0 +1,193 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from estadisticas import MIN_BYTES_PARALELO, abrir_rango, rangos_de_bytes
+
+# Mismo margen que usa scipy.stats.linregress al calcular t
+TINY = 1.0e-20
+# Filas por bloque al leer un CSV en serie
+TAM_BLOQUE = 1_000_000
+
+# Se desempaca igual que stats.linregress: pendiente, interseccion, r, p, std_err
+Ajuste = namedtuple('Ajuste', ['pendiente', 'interseccion', 'r', 'p', 'error_estandar'])
+
+
+@dataclass
+class EstadoRegresion:
+    """
+    Estadísticos suficientes de mínimos cuadrados para las columnas [x1 .. xk, y]:
+    n, el vector de medias y la matriz de co-momentos centrados
+    C = Σ (z - media)(z - media)ᵀ. Equivale a guardar Σx, Σy, Σxy, Σx² (y XᵀX, Xᵀy
+    con varias x), pero sin la cancelación de restar sumas grandes.
+    """
+    n: int = 0
+    medias: np.ndarray = None
+    comomentos: np.ndarray = None
+
+
+def estado_regresion(x, y):
+    """
+    Estado de un bloque. x es un vector (una variable) o una matriz n x k;
+    las filas con algún nulo no cuentan.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    # Una variable por renglón, como np.cov, para que un solo bloque dé lo mismo que linregress
+    z = np.vstack([x.reshape(len(x), -1).T, np.asarray(y, dtype=np.float64)])
+    z = np.ascontiguousarray(z[:, ~np.isnan(z).any(axis=0)])
+    if z.shape[1] == 0:
+        return EstadoRegresion()
+    medias = z.mean(axis=1)
+    centrados = z - medias[:, None]
+    return EstadoRegresion(n=z.shape[1], medias=medias, comomentos=centrados @ centrados.T)
+
+
+def combinar(a, b):
+    """
+    Estado de la unión de dos bloques (fórmula de Chan para medias y co-momentos).
+    """
+    if a.n == 0:
+        return b
+    if b.n == 0:
+        return a
+    n = a.n + b.n
+    delta = b.medias - a.medias
+    return EstadoRegresion(
+        n=n,
+        medias=a.medias + delta * b.n / n,
+        comomentos=a.comomentos + b.comomentos + np.outer(delta, delta) * a.n * b.n / n,
+    )
+
+
+def actualizar(estado, x, y):
+    """
+    Agrega un bloque nuevo: cuesta O(filas nuevas), no se vuelve a leer lo anterior.
+    """
+    return combinar(estado, estado_regresion(x, y))
+
+
+def combinar_estados(estados):
+    total = EstadoRegresion()
+    for estado in estados:
+        total = combinar(total, estado)
+    return total
+
+
+def ajuste(estado):
+    """
+    Pendiente, intersección, r, valor p y error estándar de la pendiente con las
+    mismas fórmulas que stats.linregress (estado de una sola variable x).
+    """
+    if estado.n == 0 or len(estado.medias) != 2:
+        raise ValueError("ajuste necesita un estado con datos de una sola variable x")
+    n = estado.n
+    xmedia, ymedia = estado.medias
+    # Como np.cov(x, y, bias=1) dentro de linregress
+    ssxm, ssxym, _, ssym = (estado.comomentos * (1.0 / n)).flat
+    if ssxm == 0.0:
+        raise ValueError("No se puede calcular la regresión lineal si todos los valores de x son iguales")
+
+    if ssym == 0.0:
+        r = np.nan if ssxym == 0 else 0.0
+    else:
+        r = float(np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0))
+
+    pendiente = ssxym / ssxm
+    interseccion = ymedia - pendiente * xmedia
+    if n == 2:
+        # Con dos puntos la recta pasa exacta; p es 1 solo si las dos y son iguales
+        return Ajuste(pendiente, interseccion, r, 1.0 if ssym == 0 else 0.0, 0.0)
+    gl = n - 2
+    t = r * np.sqrt(gl / ((1.0 - r + TINY) * (1.0 + r + TINY)))
+    p = 2 * stats.t.sf(abs(t), gl)
+    error_estandar = np.sqrt((1 - r ** 2) * ssym / ssxm / gl)
+    return Ajuste(pendiente, interseccion, r, p, error_estandar)
+
+
+def error_interseccion(estado):
+    """
+    Error estándar de la intersección (intercept_stderr de linregress).
+    """
+    if estado.n <= 2:
+        return 0.0
+    ssxm = estado.comomentos[0, 0] * (1.0 / estado.n)
+    return ajuste(estado).error_estandar * np.sqrt(ssxm + estado.medias[0] ** 2)
+
+
+def coeficientes(estado):
+    """
+    Regresión con varias x: (interseccion, vector de coeficientes) resolviendo
+    las ecuaciones normales centradas XᵀX b = Xᵀy.
+    """
+    xtx = estado.comomentos[:-1, :-1]
+    xty = estado.comomentos[:-1, -1]
+    beta = np.linalg.solve(xtx, xty)
+    return estado.medias[-1] - estado.medias[:-1] @ beta, beta
+
+
+def r_cuadrada(estado):
+    """
+    Coeficiente de determinación del ajuste de varias x.
+    """
+    _, beta = coeficientes(estado)
+    return float(estado.comomentos[:-1, -1] @ beta / estado.comomentos[-1, -1])
+
+
+def estado_de(df, x, y):
+    """
+    Estado de un DataFrame; x es el nombre de una columna o una lista de columnas.
+    """
+    return estado_regresion(df[x].to_numpy(dtype=np.float64, na_value=np.nan),
+                            df[y].to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def estado_bloques(lector, x, y, tam_bloque, opciones):
+    """
+    Estado de un CSV (ruta o archivo abierto) leído por bloques de tam_bloque filas.
+    """
+    columnas = ([x] if isinstance(x, str) else list(x)) + [y]
+    with pd.read_csv(lector, usecols=columnas, chunksize=tam_bloque, **opciones) as bloques:
+        return combinar_estados(estado_de(bloque, x, y) for bloque in bloques)
+
+
+def estado_rango(ruta, encabezado, inicio, fin, x, y, opciones, tam_bloque=TAM_BLOQUE):
+    """
+    Estado de los bytes inicio:fin del CSV, por bloques.
+    """
+    with abrir_rango(ruta, encabezado, inicio, fin) as lector:
+        return estado_bloques(lector, x, y, tam_bloque, opciones)
+
+
+def estado_csv(ruta, x, y, trabajadores=None, tam_bloque=TAM_BLOQUE, **opciones):
+    """
+    Estado de un CSV completo: en serie por bloques de tam_bloque filas, o por
+    rangos de bytes en varios procesos combinando los estados parciales.
+    """
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores <= 1 or os.path.getsize(ruta) < MIN_BYTES_PARALELO:
+        return estado_bloques(ruta, x, y, tam_bloque, opciones)
+
+    encabezado, rangos = rangos_de_bytes(ruta, trabajadores)
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        partes = pool.map(estado_rango, *zip(*[(ruta, encabezado, a, b, x, y, opciones, tam_bloque)
+                                               for a, b in rangos]))
+        return combinar_estados(list(partes))
+
+
+if __name__ == "__main__":
+    import time
+
+    inicio = time.perf_counter()
+    estado = estado_csv('housing.csv', 'median_income', 'median_house_value', tam_bloque=5000)
+    segundos = time.perf_counter() - inicio
+    resultado = ajuste(estado)
+    referencia = stats.linregress(*pd.read_csv('housing.csv', usecols=['median_income', 'median_house_value'])
+                                  [['median_income', 'median_house_value']].to_numpy().T)
+    print(f"En línea ({estado.n:,} filas, {segundos * 1000:.1f} ms): {resultado}")
+    print(f"linregress: {tuple(referencia)}")
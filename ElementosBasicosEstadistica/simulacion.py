@@ -0,0 +1,114 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Tiros por lote: el lote más grande ocupa TAM_LOTE enteros de 8 bytes (32 MB)
+TAM_LOTE = 4_000_000
+
+
+def semillas_por_lote(total, tam_lote, semilla):
+    """
+    Tamaño y semilla independiente (SeedSequence.spawn) de cada lote.
+    Como cada lote tiene su propio flujo, el resultado no depende de cuántos
+    procesos se usen, solo de la semilla y de tam_lote.
+    """
+    n_lotes = max((total + tam_lote - 1) // tam_lote, 1)
+    semillas = np.random.SeedSequence(semilla).spawn(n_lotes)
+    tamanos = [min(tam_lote, total - i * tam_lote) for i in range(n_lotes)]
+    return list(zip(semillas, tamanos))
+
+
+def lote_dados(semilla, n, caras):
+    """
+    Frecuencia de cada cara (0 .. caras-1) en n tiros.
+    """
+    rng = np.random.default_rng(semilla)
+    return np.bincount(rng.integers(0, caras, size=n), minlength=caras)
+
+
+def lote_distribucion(semilla, n, distribucion, parametros, bordes):
+    """
+    Conteo por intervalo de n muestras de rng.<distribucion>(*parametros),
+    con las reglas de np.histogram (el último intervalo incluye el borde final).
+    """
+    rng = np.random.default_rng(semilla)
+    muestras = getattr(rng, distribucion)(*parametros, size=n)
+    indices = np.searchsorted(bordes, muestras, side='right') - 1
+    indices[muestras == bordes[-1]] = len(bordes) - 2
+    dentro = (indices >= 0) & (indices < len(bordes) - 1)
+    return np.bincount(indices[dentro], minlength=len(bordes) - 1)
+
+
+def simular_en_lotes(funcion, total, semilla, tam_lote, trabajadores, *args):
+    """
+    Suma los conteos de funcion(semilla_lote, n_lote, *args) sobre todos los lotes,
+    en serie o repartidos en un pool de procesos.
+    """
+    lotes = semillas_por_lote(total, tam_lote, semilla)
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores <= 1 or len(lotes) == 1:
+        conteos = [funcion(s, n, *args) for s, n in lotes]
+    else:
+        with ProcessPoolExecutor(max_workers=min(trabajadores, len(lotes))) as pool:
+            conteos = list(pool.map(funcion, *zip(*[(s, n) + args for s, n in lotes])))
+    return np.sum(conteos, axis=0)
+
+
+def contar_dados(tiros, caras=6, semilla=None, tam_lote=TAM_LOTE, trabajadores=1):
+    """
+    Frecuencias de las caras 1 .. caras en 'tiros' lanzamientos de un dado,
+    por lotes de memoria acotada. Con la misma semilla el resultado es el mismo.
+    """
+    if semilla is None:
+        semilla = np.random.SeedSequence().entropy
+    return simular_en_lotes(lote_dados, tiros, semilla, tam_lote, trabajadores, caras)
+
+
+def histograma_distribucion(distribucion, parametros, total, bordes, semilla=None,
+                            tam_lote=TAM_LOTE, trabajadores=1):
+    """
+    Conteos por intervalo de 'total' muestras de una distribución de numpy
+    (por ejemplo 'normal', (media, sigma)) sin guardar las muestras.
+    """
+    if semilla is None:
+        semilla = np.random.SeedSequence().entropy
+    bordes = np.asarray(bordes, dtype=np.float64)
+    return simular_en_lotes(lote_distribucion, total, semilla, tam_lote, trabajadores,
+                            distribucion, tuple(parametros), bordes)
+
+
+def generadores(semilla, n):
+    """
+    n generadores independientes derivados de una sola semilla.
+    """
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(semilla).spawn(n)]
+
+
+def muestras_normales(media, sigmas, n_muestras, semilla=None):
+    """
+    Una muestra normal por cada sigma, cada una con su propio flujo aleatorio.
+    """
+    return [rng.normal(media, sigma, n_muestras) for rng, sigma in zip(generadores(semilla, len(sigmas)), sigmas)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulación de tiros de dado por lotes")
+    parser.add_argument('--tiros', type=float, default=1e9)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--tam-lote', type=int, default=TAM_LOTE)
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos (por defecto, todos los núcleos)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    frecuencias = contar_dados(int(args.tiros), semilla=args.semilla, tam_lote=args.tam_lote,
+                               trabajadores=args.trabajadores)
+    segundos = time.perf_counter() - inicio
+    total = frecuencias.sum()
+    for cara, frecuencia in enumerate(frecuencias, start=1):
+        print(f"{cara}: {frecuencia:,} ({frecuencia / total:.4%})")
+    print(f"{total:,} tiros en {segundos:.2f} s ({total / segundos:,.0f} tiros/s)")
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from scipy.spatial import distance
+
+from distancias import calcular_todas
 
 #Definimos las coordenadas de las tiendas
 tiendas={
@@ -17,20 +18,11 @@ df_tiendas_columns=['x', 'y']
 print('Coordenadas de las tiendas:')
 print(df_tiendas)
 
-#Inicializamos un dataframe para almacenar las distancias 
-distancias_eu=pd.DataFrame(index=df_tiendas.index, columns=df_tiendas.index)
-distancias_mh=pd.DataFrame(index=df_tiendas.index, columns=df_tiendas.index)
-distancias_ch=pd.DataFrame(index=df_tiendas.index, columns=df_tiendas.index)
-
-#Calculos de las distancias
-for i in df_tiendas.index:
-    for j in df_tiendas.index:
-        #distancias euclidianas
-        distancias_eu.loc[i,j]=distance.euclidean(df_tiendas.loc[i], df_tiendas.loc[j])
-        #distancia manhattan
-        distancias_mh.loc[i,j]=distance.cityblock(df_tiendas.loc[i], df_tiendas.loc[j])
-        #distancia chebyshev
-        distancias_ch.loc[i,j]=distance.chebyshev(df_tiendas.loc[i], df_tiendas.loc[j])
+#Calculos de las distancias (las tres métricas en una sola pasada)
+distancias=calcular_todas(df_tiendas)
+distancias_eu=distancias['euclidean']
+distancias_mh=distancias['cityblock']
+distancias_ch=distancias['chebyshev']
 
 #Mostrar los resultados
 print('\nDistancias euclidianas entre las tiendas:')
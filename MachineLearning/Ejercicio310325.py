@@ -3,6 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.spatial import distance
 
+from distancias import calcular_distancias, distancia_maxima_por_bloques
+from geometria import par_mas_lejano
+
 # Definimos las coordenadas de las tiendas
 puntos = {
     'Punto A': (2, 3),
@@ -20,21 +23,6 @@ df_puntos = pd.DataFrame.from_dict(puntos, orient='index', columns=['x', 'y'])
 print('Coordenadas de los puntos:')
 print(df_puntos)
 
-def calcular_distancias(df_puntos, metrica):
-    """
-    Calcula las distancias entre todos los pares de puntos usando una métrica específica
-
-    """
-    distancias = pd.DataFrame(index=df_puntos.index, columns=df_puntos.index)
-    
-    # Cálculo de distancias
-    for i in df_puntos.index:
-        for j in df_puntos.index:
-            if i != j:  # No calcula la distancia del mismo punto
-                distancias.loc[i, j] = metrica(df_puntos.loc[i], df_puntos.loc[j])
-    
-    return distancias
-
 # Calcular distancias para cada métrica
 dist_euc = calcular_distancias(df_puntos, distance.euclidean)
 dist_man = calcular_distancias(df_puntos, distance.cityblock)
@@ -42,7 +30,7 @@ dist_cheb = calcular_distancias(df_puntos, distance.chebyshev)
 
 # Función para encontrar la distancia máxima
 def encontrar_distancia_maxima(distancias):
-    max_value = distancias.values.max()
+    max_value = np.nanmax(distancias.values)
     punto1, punto2 = distancias.stack().idxmax()
     return max_value, punto1, punto2
 
@@ -66,6 +54,16 @@ print("Distancia máxima Manhattan:", dist_max_man,
 print("Distancia máxima Chebyshev:", dist_max_cheb, 
       f"entre {punto1_cheb} y {punto2_cheb}")
 
+# Para listas grandes el máximo se obtiene por bloques, sin la matriz completa
+for metrica in [distance.euclidean, distance.cityblock, distance.chebyshev]:
+    dist_max, punto1, punto2 = distancia_maxima_por_bloques(df_puntos, metrica)
+    print(f"Por bloques ({metrica.__name__}):", dist_max, f"entre {punto1} y {punto2}")
+
+# Sin matriz: casco convexo (euclidiana) o extremos de coordenadas transformadas
+for metrica in [distance.euclidean, distance.cityblock, distance.chebyshev]:
+    dist_max, punto1, punto2 = par_mas_lejano(df_puntos, metrica)
+    print(f"Geometría ({metrica.__name__}):", dist_max, f"entre {punto1} y {punto2}")
+
 # Visualización de los puntos
 plt.figure(figsize=(10, 6))
 plt.scatter(df_puntos['x'], df_puntos['y'], c='red', s=100)
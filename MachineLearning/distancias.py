@@ -0,0 +1,227 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import distance
+
+METRICAS = ('euclidean', 'cityblock', 'chebyshev')
+
+# Funciones de scipy que se pueden pasar como métrica en lugar del nombre
+NOMBRES_METRICAS = {
+    distance.euclidean: 'euclidean',
+    distance.cityblock: 'cityblock',
+    distance.chebyshev: 'chebyshev',
+}
+
+# Filas por bloque: cada métrica usa un arreglo temporal de filas x n flotantes
+FILAS_POR_BLOQUE = 256
+
+# Lado de las teselas del modo por bloques (2048 x 2048 float64 = 32 MB por métrica)
+TAM_TESELA = 2048
+
+
+def nombre_metrica(metrica):
+    """
+    Nombre de la métrica ('euclidean', 'cityblock' o 'chebyshev') a partir
+    del nombre o de la función de scipy.spatial.distance.
+    """
+    nombre = NOMBRES_METRICAS.get(metrica, metrica)
+    if nombre not in METRICAS:
+        raise ValueError(f"Métrica no soportada: {metrica}. Use una de {METRICAS}")
+    return nombre
+
+
+def es_conocida(metrica):
+    """
+    True si la métrica tiene el cálculo vectorizado propio de este módulo.
+    """
+    return NOMBRES_METRICAS.get(metrica, metrica) in METRICAS
+
+
+def clave_metrica(metrica):
+    """
+    Clave de la métrica en los resultados: el nombre de las conocidas y
+    la métrica tal cual (nombre de scipy o función) para las demás.
+    """
+    return nombre_metrica(metrica) if es_conocida(metrica) else metrica
+
+
+def coordenadas(df_puntos):
+    """
+    Coordenadas de un DataFrame de puntos como arreglo float64 (n x dimensiones).
+    """
+    return np.ascontiguousarray(df_puntos.to_numpy(dtype=np.float64))
+
+
+def distancias_bloque(a, b, metricas):
+    """
+    Distancias entre cada fila de a y cada fila de b para varias métricas.
+    Se recorre una dimensión a la vez: la diferencia absoluta de cada
+    coordenada se calcula una sola vez y la acumulan todas las métricas.
+    """
+    cuadrados = abs_suma = maximo = None
+    for k in range(a.shape[1]):
+        dif = np.abs(a[:, k, None] - b[None, :, k])
+        if 'euclidean' in metricas:
+            cuadrados = dif * dif if cuadrados is None else cuadrados + dif * dif
+        if 'cityblock' in metricas:
+            abs_suma = dif.copy() if abs_suma is None else abs_suma + dif
+        if 'chebyshev' in metricas:
+            maximo = dif if maximo is None else np.maximum(maximo, dif)
+
+    resultado = {}
+    for nombre in metricas:
+        if nombre == 'euclidean':
+            resultado[nombre] = np.sqrt(cuadrados)
+        elif nombre == 'cityblock':
+            resultado[nombre] = abs_suma
+        else:
+            resultado[nombre] = maximo
+    return resultado
+
+
+def matrices_distancia(x, metricas=METRICAS, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Matrices de distancias n x n (float64) para todas las métricas en una pasada.
+    Solo se calcula el triángulo superior, por bloques de filas, y cada bloque
+    se refleja en el triángulo inferior.
+    """
+    metricas = [nombre_metrica(m) for m in metricas]
+    n = len(x)
+    matrices = {nombre: np.zeros((n, n)) for nombre in metricas}
+
+    for inicio in range(0, n, filas_por_bloque):
+        fin = min(inicio + filas_por_bloque, n)
+        # Columnas desde 'inicio': el bloque cubre su parte del triángulo superior
+        bloque = distancias_bloque(x[inicio:fin], x[inicio:], metricas)
+        for nombre in metricas:
+            matrices[nombre][inicio:fin, inicio:] = bloque[nombre]
+            matrices[nombre][inicio:, inicio:fin] = bloque[nombre].T
+    return matrices
+
+
+def calcular_todas(df_puntos, metricas=METRICAS, diagonal=0.0):
+    """
+    DataFrames de distancias (índice y columnas = puntos) para cada métrica.
+    Euclidiana, Manhattan y Chebyshev van por el cálculo vectorizado; cualquier
+    otra métrica (nombre o función que acepte dos vectores) se pasa a
+    scipy.spatial.distance.cdist.
+    """
+    x = coordenadas(df_puntos)
+    rapidas = matrices_distancia(x, [m for m in metricas if es_conocida(m)])
+    resultado = {}
+    for metrica in metricas:
+        clave = clave_metrica(metrica)
+        m = rapidas[clave] if es_conocida(metrica) else distance.cdist(x, x, metrica)
+        np.fill_diagonal(m, diagonal)
+        resultado[clave] = pd.DataFrame(m, index=df_puntos.index, columns=df_puntos.index)
+    return resultado
+
+
+def calcular_distancias(df_puntos, metrica, diagonal=np.nan):
+    """
+    Calcula las distancias entre todos los pares de puntos usando una métrica específica.
+    metrica puede ser el nombre o la función de scipy (distance.euclidean, ...)
+    o cualquier otra función de dos vectores.
+    La diagonal (distancia de un punto consigo mismo) queda en NaN como en el ejercicio.
+    """
+    return calcular_todas(df_puntos, [metrica], diagonal)[clave_metrica(metrica)]
+
+
+def recorrer_teselas(n, tam_tesela):
+    """
+    Teselas (fila0, fila1, col0, col1) del triángulo superior de una matriz n x n.
+    """
+    for fila0 in range(0, n, tam_tesela):
+        for col0 in range(fila0, n, tam_tesela):
+            yield fila0, min(fila0 + tam_tesela, n), col0, min(col0 + tam_tesela, n)
+
+
+def nuevas_reducciones(n):
+    return {
+        'maximo': np.full(n, -np.inf),
+        'argmax': np.full(n, -1, dtype=np.int64),
+        'minimo': np.full(n, np.inf),
+        'argmin': np.full(n, -1, dtype=np.int64),
+    }
+
+
+def actualizar_reducciones(reducciones, tesela, fila0, col0, es_diagonal=False):
+    """
+    Actualiza máximo, mínimo y sus columnas para las filas de una tesela.
+    La distancia de un punto consigo mismo no cuenta. Como las columnas llegan en
+    orden creciente, un empate conserva la primera columna (igual que argmax).
+    """
+    filas = slice(fila0, fila0 + tesela.shape[0])
+    alto = np.arange(tesela.shape[0])
+    para_max, para_min = tesela, tesela
+    if es_diagonal:
+        para_max = tesela.copy()
+        np.fill_diagonal(para_max, -np.inf)
+        para_min = tesela.copy()
+        np.fill_diagonal(para_min, np.inf)
+
+    j = para_max.argmax(axis=1)
+    valor = para_max[alto, j]
+    mejor = valor > reducciones['maximo'][filas]
+    reducciones['maximo'][filas] = np.where(mejor, valor, reducciones['maximo'][filas])
+    reducciones['argmax'][filas] = np.where(mejor, j + col0, reducciones['argmax'][filas])
+
+    j = para_min.argmin(axis=1)
+    valor = para_min[alto, j]
+    mejor = valor < reducciones['minimo'][filas]
+    reducciones['minimo'][filas] = np.where(mejor, valor, reducciones['minimo'][filas])
+    reducciones['argmin'][filas] = np.where(mejor, j + col0, reducciones['argmin'][filas])
+
+
+def matriz_por_bloques(x, metricas=METRICAS, directorio=None, tam_tesela=TAM_TESELA):
+    """
+    Distancias por teselas sin tener la matriz completa en memoria.
+    Cada tesela del triángulo superior se calcula una vez; si se indica directorio,
+    se escribe (y se refleja) en un archivo .npy mapeado en memoria por métrica
+    (distancias_<metrica>.npy, se abre con np.load(ruta, mmap_mode='r')).
+    Mientras tanto se acumulan por fila el máximo, el mínimo y sus columnas.
+    Devuelve {metrica: DataFrame con maximo, argmax, minimo, argmin} y las rutas.
+    """
+    metricas = [nombre_metrica(m) for m in metricas]
+    n = len(x)
+    reducciones = {nombre: nuevas_reducciones(n) for nombre in metricas}
+
+    salidas = {}
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+        for nombre in metricas:
+            ruta = os.path.join(directorio, f"distancias_{nombre}.npy")
+            salidas[nombre] = np.lib.format.open_memmap(ruta, mode='w+', dtype=np.float64, shape=(n, n))
+
+    for fila0, fila1, col0, col1 in recorrer_teselas(n, tam_tesela):
+        teselas = distancias_bloque(x[fila0:fila1], x[col0:col1], metricas)
+        diagonal = fila0 == col0
+        for nombre, tesela in teselas.items():
+            if nombre in salidas:
+                salidas[nombre][fila0:fila1, col0:col1] = tesela
+                if not diagonal:
+                    salidas[nombre][col0:col1, fila0:fila1] = tesela.T
+            actualizar_reducciones(reducciones[nombre], tesela, fila0, col0, diagonal)
+            if not diagonal:
+                # La tesela reflejada aporta a las filas col0:col1
+                actualizar_reducciones(reducciones[nombre], tesela.T, col0, fila0)
+
+    rutas = {}
+    for nombre, salida in salidas.items():
+        salida.flush()
+        rutas[nombre] = salida.filename
+    return {nombre: pd.DataFrame(r) for nombre, r in reducciones.items()}, rutas
+
+
+def distancia_maxima_por_bloques(df_puntos, metrica, directorio=None, tam_tesela=TAM_TESELA):
+    """
+    Igual que encontrar_distancia_maxima(calcular_distancias(df_puntos, metrica)),
+    pero con las reducciones por fila de matriz_por_bloques.
+    Devuelve (distancia máxima, punto1, punto2).
+    """
+    nombre = nombre_metrica(metrica)
+    reducciones, _ = matriz_por_bloques(coordenadas(df_puntos), [nombre], directorio, tam_tesela)
+    r = reducciones[nombre]
+    i = int(r['maximo'].to_numpy().argmax())
+    return r['maximo'].iat[i], df_puntos.index[i], df_puntos.index[r['argmax'].iat[i]]
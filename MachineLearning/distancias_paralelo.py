@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from distancias import METRICAS, coordenadas, distancias_bloque, matrices_distancia, nombre_metrica
+
+# Con menos puntos que esto el costo de crear el pool supera la ganancia
+MIN_PUNTOS_PARALELO = 2000
+FILAS_POR_TAREA = 512
+
+# Arreglos compartidos que cada proceso trabajador abre una sola vez
+_compartidos = {}
+
+
+def crear_compartido(forma):
+    """
+    Arreglo float64 en memoria compartida; devuelve (memoria, arreglo).
+    """
+    tam = max(int(np.prod(forma)) * 8, 1)
+    memoria = shared_memory.SharedMemory(create=True, size=tam)
+    return memoria, np.ndarray(forma, dtype=np.float64, buffer=memoria.buf)
+
+
+def inicializar_trabajador(descripcion):
+    """
+    Abre en el trabajador la memoria compartida de las coordenadas y de las matrices.
+    descripcion = {clave: (nombre de la memoria, forma)}.
+    """
+    for clave, (nombre, forma) in descripcion.items():
+        memoria = shared_memory.SharedMemory(name=nombre)
+        _compartidos[clave] = (memoria, np.ndarray(forma, dtype=np.float64, buffer=memoria.buf))
+
+
+def calcular_tarea(metrica, inicio, fin):
+    """
+    Filas inicio:fin del triángulo superior de una métrica, escritas (y reflejadas)
+    directamente en la matriz compartida. Las tareas escriben regiones disjuntas,
+    así que el resultado no depende del orden en que terminen.
+    """
+    x = _compartidos['x'][1]
+    salida = _compartidos[metrica][1]
+    bloque = distancias_bloque(x[inicio:fin], x[inicio:], [metrica])[metrica]
+    salida[inicio:fin, inicio:] = bloque
+    salida[inicio:, inicio:fin] = bloque.T
+    return metrica, inicio, fin
+
+
+def matrices_distancia_paralelo(x, metricas=METRICAS, trabajadores=None, filas_por_tarea=FILAS_POR_TAREA):
+    """
+    Igual que distancias.matrices_distancia, repartiendo el trabajo por métrica
+    y por bloque de filas en un pool de procesos. Las coordenadas y las matrices
+    viven en memoria compartida: a los trabajadores solo se les envían índices.
+    Con un trabajador o pocos puntos se calcula en serie.
+    """
+    metricas = [nombre_metrica(m) for m in metricas]
+    n = len(x)
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores <= 1 or n < MIN_PUNTOS_PARALELO:
+        return matrices_distancia(x, metricas)
+
+    memorias = []
+    try:
+        memoria_x, x_compartido = crear_compartido(x.shape)
+        memorias.append(memoria_x)
+        x_compartido[:] = x
+        descripcion = {'x': (memoria_x.name, x.shape)}
+        salidas = {}
+        for nombre in metricas:
+            memoria, salidas[nombre] = crear_compartido((n, n))
+            memorias.append(memoria)
+            descripcion[nombre] = (memoria.name, (n, n))
+
+        tareas = [(nombre, inicio, min(inicio + filas_por_tarea, n))
+                  for inicio in range(0, n, filas_por_tarea) for nombre in metricas]
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=inicializar_trabajador,
+                                 initargs=(descripcion,)) as pool:
+            list(pool.map(calcular_tarea, *zip(*tareas)))
+
+        # Copia fuera de la memoria compartida antes de liberarla
+        return {nombre: salidas[nombre].copy() for nombre in metricas}
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+
+
+def calcular_todas_paralelo(df_puntos, metricas=METRICAS, trabajadores=None, diagonal=0.0):
+    """
+    Versión en paralelo de distancias.calcular_todas (mismos DataFrames).
+    """
+    matrices = matrices_distancia_paralelo(coordenadas(df_puntos), metricas, trabajadores)
+    resultado = {}
+    for nombre, m in matrices.items():
+        np.fill_diagonal(m, diagonal)
+        resultado[nombre] = pd.DataFrame(m, index=df_puntos.index, columns=df_puntos.index)
+    return resultado
+
+
+def medir_aceleracion(x, metricas=METRICAS, trabajadores=None):
+    """
+    Tiempo en un núcleo contra el pool de procesos, y si los resultados coinciden.
+    """
+    inicio = time.perf_counter()
+    serie = matrices_distancia(x, metricas)
+    segundos_serie = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = matrices_distancia_paralelo(x, metricas, trabajadores)
+    segundos_paralelo = time.perf_counter() - inicio
+
+    return {
+        'puntos': len(x),
+        'trabajadores': trabajadores or os.cpu_count(),
+        'segundos_un_nucleo': segundos_serie,
+        'segundos_paralelo': segundos_paralelo,
+        'aceleracion': segundos_serie / segundos_paralelo,
+        'iguales': all(np.array_equal(serie[m], paralelo[m]) for m in serie),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distancias entre puntos en varios procesos")
+    parser.add_argument('--puntos', type=int, default=5000)
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos del pool (por defecto, todos los núcleos)")
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    x = np.random.default_rng(args.semilla).random((args.puntos, 2)) * 100
+    r = medir_aceleracion(x, METRICAS, args.trabajadores)
+    print(f"{r['puntos']:,} puntos, {r['trabajadores']} trabajadores")
+    print(f"Un núcleo: {r['segundos_un_nucleo']:.2f} s")
+    print(f"Paralelo:  {r['segundos_paralelo']:.2f} s (aceleración {r['aceleracion']:.2f}x)")
+    print(f"Resultados idénticos: {r['iguales']}")
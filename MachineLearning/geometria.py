@@ -0,0 +1,211 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import ConvexHull, QhullError, cKDTree
+
+from distancias import coordenadas, distancias_bloque, matriz_por_bloques, nombre_metrica
+
+# Parámetro p de la norma de Minkowski que usa cKDTree para cada métrica
+NORMAS_KDTREE = {'euclidean': 2, 'cityblock': 1, 'chebyshev': np.inf}
+
+# Tolerancia relativa para considerar empatadas dos distancias
+TOLERANCIA = 1e-12
+
+
+def par_canonico(grupos_a, grupos_b):
+    """
+    Entre los pares (a, b) con a en grupos_a[t] y b en grupos_b[t] (para algún t),
+    devuelve el que da calcular_distancias(...).stack().idxmax(): la fila más
+    pequeña y, en esa fila, la columna más pequeña.
+    """
+    mejor = None
+    for a, b in zip(grupos_a, grupos_b):
+        i, j = min(a), min(b)
+        par = (min(i, j), max(i, j))
+        if mejor is None or par < mejor:
+            mejor = par
+    return mejor
+
+
+def casco_convexo(x):
+    """
+    Índices de los vértices del casco convexo en sentido antihorario.
+    Con puntos colineales devuelve solo los dos extremos.
+    """
+    if len(x) < 3:
+        return np.arange(len(x))
+    try:
+        return ConvexHull(x).vertices
+    except QhullError:
+        orden = np.lexsort((x[:, 1], x[:, 0]))
+        return np.array([orden[0], orden[-1]])
+
+
+def pares_antipodales(h):
+    """
+    Pares candidatos de vértices antipodales del casco h (antihorario) con calibradores
+    rotatorios: para cada arista se avanza el vértice más alejado de ella.
+    Se incluye también el siguiente vértice para no perder empates con aristas paralelas.
+    """
+    m = len(h)
+    if m <= 3:
+        return list(itertools.combinations(range(m), 2))
+
+    def area(i, j, k):
+        return abs((h[j, 0] - h[i, 0]) * (h[k, 1] - h[i, 1]) - (h[j, 1] - h[i, 1]) * (h[k, 0] - h[i, 0]))
+
+    pares = []
+    j = 1
+    for i in range(m):
+        siguiente = (i + 1) % m
+        while area(i, siguiente, (j + 1) % m) > area(i, siguiente, j):
+            j = (j + 1) % m
+        for k in (j, (j + 1) % m):
+            pares += [(i, k), (siguiente, k)]
+    return pares
+
+
+def par_mas_lejano_euclidiano(x):
+    """
+    Par más lejano (distancia euclidiana, 2D) en O(n log n):
+    casco convexo de los puntos distintos + calibradores rotatorios.
+    """
+    unicos, primero, inverso = np.unique(x, axis=0, return_index=True, return_inverse=True)
+    if len(unicos) == 1:
+        return 0.0, (0, 1)
+
+    vertices = casco_convexo(unicos)
+    pares = np.array(pares_antipodales(unicos[vertices]))
+    a, b = vertices[pares[:, 0]], vertices[pares[:, 1]]
+    cuadrados = ((unicos[a] - unicos[b]) ** 2).sum(axis=1)
+    empate = cuadrados >= cuadrados.max() * (1 - TOLERANCIA)
+
+    # Cada punto distinto representa a todas sus copias; basta su primer índice
+    par = par_canonico([[primero[u]] for u in a[empate]], [[primero[v]] for v in b[empate]])
+    return distancia_par(x, par, 'euclidean'), par
+
+
+def transformaciones(nombre, dimensiones):
+    """
+    Proyecciones lineales cuyo rango (máximo - mínimo) da la distancia máxima:
+    cityblock usa las combinaciones de signos de las coordenadas
+    y chebyshev cada coordenada por separado.
+    """
+    if nombre == 'cityblock':
+        signos = itertools.product([1.0, -1.0], repeat=dimensiones - 1)
+        return np.array([(1.0,) + s for s in signos])
+    return np.eye(dimensiones)
+
+
+def par_mas_lejano_extremos(x, nombre):
+    """
+    Par más lejano para cityblock o chebyshev en O(n · proyecciones):
+    la distancia máxima es el mayor rango de las coordenadas transformadas,
+    y los pares que la alcanzan son los extremos de esa proyección.
+    """
+    proyecciones = x @ transformaciones(nombre, x.shape[1]).T
+    rangos = proyecciones.max(axis=0) - proyecciones.min(axis=0)
+    if rangos.max() == 0:
+        return 0.0, (0, 1)
+
+    maximos, minimos = [], []
+    for t in np.flatnonzero(rangos >= rangos.max() * (1 - TOLERANCIA)):
+        s = proyecciones[:, t]
+        maximos.append(np.flatnonzero(s >= s.max() - rangos[t] * TOLERANCIA))
+        minimos.append(np.flatnonzero(s <= s.min() + rangos[t] * TOLERANCIA))
+    par = par_canonico(maximos, minimos)
+    return distancia_par(x, par, nombre), par
+
+
+def distancia_par(x, par, nombre):
+    """
+    Distancia de un par con la misma fórmula que la matriz de distancias.
+    """
+    i, j = par
+    return distancias_bloque(x[[i]], x[[j]], [nombre])[nombre][0, 0]
+
+
+def par_mas_lejano(df_puntos, metrica='euclidean'):
+    """
+    Par de puntos más lejano sin calcular la matriz de distancias.
+    Devuelve (distancia máxima, punto1, punto2), igual que
+    encontrar_distancia_maxima(calcular_distancias(df_puntos, metrica)).
+    La euclidiana fuera de 2D usa las reducciones por bloques de distancias.py.
+    """
+    nombre = nombre_metrica(metrica)
+    x = coordenadas(df_puntos)
+    if len(x) < 2:
+        raise ValueError("Se necesitan al menos dos puntos")
+
+    if nombre != 'euclidean':
+        valor, (i, j) = par_mas_lejano_extremos(x, nombre)
+    elif x.shape[1] == 2:
+        valor, (i, j) = par_mas_lejano_euclidiano(x)
+    else:
+        reducciones, _ = matriz_por_bloques(x, [nombre])
+        r = reducciones[nombre]
+        i = int(r['maximo'].to_numpy().argmax())
+        valor, j = r['maximo'].iat[i], int(r['argmax'].iat[i])
+    return valor, df_puntos.index[i], df_puntos.index[j]
+
+
+class IndiceTiendas:
+    """
+    Índice KD-tree sobre las coordenadas de las tiendas para consultar
+    en lote la tienda más cercana (o las k más cercanas) a muchos puntos.
+    Los empates se resuelven por el orden de las tiendas en df_tiendas.
+    """
+
+    def __init__(self, df_tiendas):
+        self.tiendas = df_tiendas.index
+        self.x = coordenadas(df_tiendas)
+        self.arbol = cKDTree(self.x)
+
+    def consultar(self, puntos, k=1, metrica='euclidean'):
+        """
+        Índices (n x k) y distancias (n x k) de las k tiendas más cercanas a cada punto.
+        """
+        nombre = nombre_metrica(metrica)
+        p = NORMAS_KDTREE[nombre]
+        k = min(k, len(self.x))
+        # Un vecino extra permite detectar empates en el límite del k-ésimo
+        extra = min(k + 1, len(self.x))
+        distancias, indices = self.arbol.query(puntos, k=extra, p=p)
+        distancias, indices = distancias.reshape(len(puntos), extra), indices.reshape(len(puntos), extra)
+
+        orden = np.lexsort((indices, distancias), axis=-1)
+        distancias = np.take_along_axis(distancias, orden, axis=1)
+        indices = np.take_along_axis(indices, orden, axis=1)
+
+        # Si el k-ésimo empata con el siguiente, puede haber más tiendas a esa distancia
+        if extra > k:
+            dudosas = np.flatnonzero(distancias[:, k] <= distancias[:, k - 1] * (1 + TOLERANCIA))
+            for fila in dudosas:
+                radio = distancias[fila, k - 1] * (1 + TOLERANCIA)
+                candidatas = np.array(self.arbol.query_ball_point(puntos[fila], radio, p=p))
+                d = distancias_bloque(puntos[[fila]], self.x[candidatas], [nombre])[nombre][0]
+                mejores = np.lexsort((candidatas, d))[:k]
+                indices[fila, :k], distancias[fila, :k] = candidatas[mejores], d[mejores]
+        return indices[:, :k], distancias[:, :k]
+
+    def mas_cercana(self, df_puntos, metrica='euclidean'):
+        """
+        DataFrame con la tienda más cercana a cada punto y su distancia.
+        """
+        indices, distancias = self.consultar(coordenadas(df_puntos), 1, metrica)
+        return pd.DataFrame({'tienda': self.tiendas[indices[:, 0]], 'distancia': distancias[:, 0]},
+                            index=df_puntos.index)
+
+    def k_mas_cercanas(self, df_puntos, k, metrica='euclidean'):
+        """
+        DataFrame en formato largo (punto, orden) con las k tiendas más cercanas.
+        """
+        indices, distancias = self.consultar(coordenadas(df_puntos), k, metrica)
+        k = indices.shape[1]
+        return pd.DataFrame({
+            'punto': np.repeat(df_puntos.index.to_numpy(), k),
+            'orden': np.tile(np.arange(1, k + 1), len(df_puntos)),
+            'tienda': self.tiendas[indices.ravel()],
+            'distancia': distancias.ravel(),
+        })